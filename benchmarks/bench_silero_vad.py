@@ -0,0 +1,360 @@
+"""
+Benchmarks for Silero VAD Lite: per-window latency, throughput (single-threaded, and across threads and processes), construction time, resident memory per instance, and import time.
+
+Results are written as JSON, so runs can be compared between releases (or between ONNX Runtime upgrades) with `--compare`:
+
+    python benchmarks/bench_silero_vad.py --output bench_before.json
+    python benchmarks/bench_silero_vad.py --output bench_after.json --compare bench_before.json
+
+Use `--quick` for a fast smoke run with fewer iterations.
+"""
+
+import argparse
+import array
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+from silero_vad_lite import SileroVAD
+
+_SAMPLE_WAV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'sample.wav')
+
+
+def load_sample_wav(file_path=_SAMPLE_WAV_PATH):
+    """
+    Returns the mono 16-bit WAV file as an array of float32 samples, along with its sample rate.
+    """
+    with wave.open(file_path, 'rb') as wav_file:
+        assert wav_file.getnchannels() == 1 and wav_file.getsampwidth() == 2
+        sample_rate = wav_file.getframerate()
+        int16_samples = array.array('h', wav_file.readframes(wav_file.getnframes()))
+    if sys.byteorder == 'big':
+        int16_samples.byteswap()
+    return array.array('f', (sample / 32768.0 for sample in int16_samples)), sample_rate
+
+
+def _generate_synthetic_audio(duration_s, sample_rate, seed=0):
+    """
+    Returns deterministic synthetic audio, alternating between noise and noisy tone bursts, as an array of float32 samples.
+    """
+    rng = random.Random(seed)
+    samples = array.array('f', bytes(4 * int(duration_s * sample_rate)))
+    for i in range(len(samples)):
+        t = i / sample_rate
+        tone = 0.3 * math.sin(2 * math.pi * 220 * t) * math.sin(2 * math.pi * 150 * t) if int(t) % 2 == 0 else 0.0
+        samples[i] = tone + rng.gauss(0.0, 0.02)
+    return samples
+
+
+def _tile(samples, num_samples):
+    """
+    Returns the samples repeated (and truncated) to exactly the given length.
+    """
+    repeats = num_samples // len(samples) + 1
+    return (samples * repeats)[:num_samples]
+
+
+def _get_rss_bytes():
+    """
+    Returns the current resident set size of this process in bytes, or None if it cannot be determined.
+    """
+    try:
+        with open('/proc/self/statm') as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summarize_times_us(times_ns):
+    times_us = sorted(t / 1000 for t in times_ns)
+    return dict(
+        count=len(times_us),
+        mean_us=statistics.fmean(times_us),
+        p50_us=_percentile(times_us, 0.50),
+        p90_us=_percentile(times_us, 0.90),
+        p99_us=_percentile(times_us, 0.99),
+        max_us=times_us[-1],
+    )
+
+
+def bench_import_time(repeats):
+    """
+    Measures the time to import the package, and to import it and create the first SileroVAD (loading the model), each in a fresh interpreter.
+    """
+    import_code = "import time; t = time.perf_counter(); import silero_vad_lite; print(time.perf_counter() - t)"
+    first_vad_code = "import time; t = time.perf_counter(); import silero_vad_lite; silero_vad_lite.SileroVAD(16000); print(time.perf_counter() - t)"
+    results = {}
+    for name, code in [('import', import_code), ('import_and_first_instance', first_vad_code)]:
+        times_ms = [1000 * float(subprocess.check_output([sys.executable, '-c', code], env=os.environ)) for _ in range(repeats)]
+        results[name] = dict(median_ms=statistics.median(times_ms), min_ms=min(times_ms))
+    return results
+
+
+def bench_construction(sample_rate, repeats):
+    """
+    Measures the construction time of SileroVAD objects: the first one in this process loads the model (unless another object using it is still alive), and the rest share its session.
+    """
+    start = time.perf_counter_ns()
+    first_vad = SileroVAD(sample_rate)
+    first_ns = time.perf_counter_ns() - start
+    times_ns = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        vad = SileroVAD(sample_rate)
+        times_ns.append(time.perf_counter_ns() - start)
+        del vad
+    del first_vad
+    return dict(first_ms=first_ns / 1e6, shared_session=_summarize_times_us(times_ns))
+
+
+def bench_memory(sample_rate, num_instances):
+    """
+    Measures the resident memory used by the first SileroVAD object (including the model session), and the average per additional object.
+    """
+    rss_before = _get_rss_bytes()
+    if rss_before is None:
+        return None
+    vads = [SileroVAD(sample_rate)]
+    window = bytes(4 * vads[0].window_size_samples)
+    vads[0].process(window)
+    rss_first = _get_rss_bytes()
+    for _ in range(num_instances):
+        vad = SileroVAD(sample_rate)
+        vad.process(window)  # Include the buffers allocated by the first run
+        vads.append(vad)
+    rss_after = _get_rss_bytes()
+    return dict(
+        first_instance_mb=(rss_first - rss_before) / 2**20,
+        per_additional_instance_kb=(rss_after - rss_first) / num_instances / 2**10,
+        num_instances=num_instances,
+    )
+
+
+def bench_latency(samples, sample_rate, num_windows, num_warmup):
+    """
+    Measures the latency of `process` for each window of real audio.
+    """
+    vad = SileroVAD(sample_rate)
+    window_size = vad.window_size_samples
+    samples = _tile(samples, (num_windows + num_warmup) * window_size)
+    windows = [memoryview(samples)[i * window_size:(i + 1) * window_size] for i in range(num_windows + num_warmup)]
+    for window in windows[:num_warmup]:
+        vad.process(window)
+    times_ns = []
+    perf_counter_ns = time.perf_counter_ns
+    for window in windows[num_warmup:]:
+        start = perf_counter_ns()
+        vad.process(window)
+        times_ns.append(perf_counter_ns() - start)
+    return _summarize_times_us(times_ns)
+
+
+def _prepare_throughput(samples, sample_rate):
+    """
+    Creates and warms up a new SileroVAD, returning it with the complete windows of the samples and an output buffer, for `_time_throughput`.
+    """
+    vad = SileroVAD(sample_rate)
+    num_windows = len(samples) // vad.window_size_samples
+    data = memoryview(samples)[:num_windows * vad.window_size_samples]
+    out = array.array('f', bytes(4 * num_windows))
+    vad.process_many(data[:vad.window_size_samples], out=out)  # Warm up
+    vad.reset()
+    return vad, data, out
+
+
+def _time_throughput(vad, data, out):
+    """
+    Processes all windows of the prepared data with `process_many`, returning the number of windows and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    vad.process_many(data, out=out)
+    return len(out), time.perf_counter() - start
+
+
+def _run_throughput(samples, sample_rate):
+    """
+    Processes all complete windows of the samples with `process_many` on a new SileroVAD, returning the number of windows and the elapsed time in seconds (excluding its construction and warm-up).
+    """
+    return _time_throughput(*_prepare_throughput(samples, sample_rate))
+
+
+def _summarize_throughput(total_windows, elapsed_s, sample_rate, window_size):
+    audio_s = total_windows * window_size / sample_rate
+    return dict(windows=total_windows, elapsed_s=elapsed_s, windows_per_s=total_windows / elapsed_s, realtime_factor=audio_s / elapsed_s)
+
+
+def bench_throughput_threads(samples, sample_rate, num_workers):
+    """
+    Measures the aggregate throughput of independent streams processed on separate threads, each with its own SileroVAD (the model runs without holding the GIL). The objects are created and warmed up before the clock starts.
+    """
+    barrier = threading.Barrier(num_workers + 1)
+    results = [None] * num_workers
+
+    def worker(index):
+        prepared = _prepare_throughput(samples, sample_rate)
+        barrier.wait()
+        results[index] = _time_throughput(*prepared)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed_s = time.perf_counter() - start
+    return sum(num_windows for num_windows, _ in results), elapsed_s
+
+
+def _process_worker(samples_bytes, sample_rate, barrier, results):
+    samples = array.array('f')
+    samples.frombytes(samples_bytes)
+    prepared = _prepare_throughput(samples, sample_rate)  # Load the model and warm up before starting the clock
+    barrier.wait()
+    start = time.time()
+    num_windows, _ = _time_throughput(*prepared)
+    results.put((num_windows, start, time.time()))
+
+
+def bench_throughput_processes(samples, sample_rate, num_workers):
+    """
+    Measures the aggregate throughput of independent streams processed in separate processes, each with its own model session.
+    """
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(num_workers)
+    results = context.Queue()
+    processes = [context.Process(target=_process_worker, args=(samples.tobytes(), sample_rate, barrier, results)) for _ in range(num_workers)]
+    for process in processes:
+        process.start()
+    worker_results = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed_s = max(end for _, _, end in worker_results) - min(start for _, start, _ in worker_results)
+    return sum(num_windows for num_windows, _, _ in worker_results), elapsed_s
+
+
+def run_benchmarks(args):
+    sample_samples, sample_rate = load_sample_wav()
+    long_samples = _generate_synthetic_audio(args.duration, sample_rate)
+    window_size = SileroVAD(sample_rate).window_size_samples
+    results = {}
+
+    print("Measuring import time...", file=sys.stderr)
+    results['import_time'] = bench_import_time(args.import_repeats)
+
+    print("Measuring construction time...", file=sys.stderr)
+    results['construction'] = bench_construction(sample_rate, args.construction_repeats)
+
+    print("Measuring memory...", file=sys.stderr)
+    results['memory'] = bench_memory(sample_rate, args.memory_instances)
+
+    print("Measuring process latency...", file=sys.stderr)
+    results['process_latency'] = bench_latency(sample_samples, sample_rate, args.latency_windows, args.warmup_windows)
+
+    print("Measuring single-threaded throughput...", file=sys.stderr)
+    results['throughput_single'] = _summarize_throughput(*_run_throughput(long_samples, sample_rate), sample_rate, window_size)
+
+    results['throughput_threads'] = {}
+    results['throughput_processes'] = {}
+    for num_workers in args.workers:
+        print(f"Measuring throughput with {num_workers} threads and processes...", file=sys.stderr)
+        results['throughput_threads'][str(num_workers)] = _summarize_throughput(*bench_throughput_threads(long_samples, sample_rate, num_workers), sample_rate, window_size)
+        results['throughput_processes'][str(num_workers)] = _summarize_throughput(*bench_throughput_processes(long_samples, sample_rate, num_workers), sample_rate, window_size)
+
+    return dict(metadata=_get_metadata(args, sample_rate), results=results)
+
+
+def _get_metadata(args, sample_rate):
+    try:
+        from importlib.metadata import version
+        package_version = version('silero-vad-lite')
+    except Exception:
+        package_version = None
+    return dict(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        package_version=package_version,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+        sample_rate=sample_rate,
+        arguments=vars(args),
+    )
+
+
+def _flatten(results, prefix=''):
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f'{prefix}{key}.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f'{prefix}{key}', value
+
+
+def compare_results(baseline, current):
+    """
+    Prints each numeric result alongside its baseline value and the relative change.
+    """
+    baseline_values = dict(_flatten(baseline['results']))
+    for key, value in _flatten(current['results']):
+        if key in baseline_values and baseline_values[key]:
+            change = (value - baseline_values[key]) / baseline_values[key]
+            print(f"{key:60} {baseline_values[key]:14.3f} -> {value:14.3f}  ({change:+.1%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Silero VAD Lite.")
+    parser.add_argument('--output', help="Path of the JSON file to write the results to (default: print to stdout)")
+    parser.add_argument('--compare', help="Path of a previous JSON results file to compare against")
+    parser.add_argument('--quick', action='store_true', help="Run fewer iterations, for a fast smoke test")
+    parser.add_argument('--duration', type=float, help="Duration of the synthetic audio for throughput, in seconds (default: 600, or 30 with --quick)")
+    parser.add_argument('--workers', type=lambda value: [int(n) for n in value.split(',')], help="Comma-separated numbers of threads/processes for throughput (default: 1,2,4,...,cpu count)")
+    args = parser.parse_args(argv)
+
+    if args.duration is None:
+        args.duration = 30.0 if args.quick else 600.0
+    if args.workers is None:
+        cpu_count = os.cpu_count() or 1
+        args.workers = sorted({n for n in (1, 2, 4, 8, 16, 32, 64) if n < cpu_count} | {cpu_count})
+        if args.quick:
+            args.workers = args.workers[:2]
+    args.import_repeats = 3 if args.quick else 10
+    args.construction_repeats = 10 if args.quick else 100
+    args.memory_instances = 10 if args.quick else 100
+    args.latency_windows = 200 if args.quick else 5000
+    args.warmup_windows = 20 if args.quick else 100
+
+    report = run_benchmarks(args)
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report_json + '\n')
+    else:
+        print(report_json)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            compare_results(json.load(baseline_file), report)
+
+
+if __name__ == '__main__':
+    main()
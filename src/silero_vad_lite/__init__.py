@@ -1,3 +1,7 @@
 from .silero_vad import SileroVAD
+from .batch import SileroVADBatch, SileroVADMultiChannel
+from .pool import SileroVADPool
+from .segmenter import SpeechSegmenter, get_speech_timestamps
+from .service import AsyncSileroVADService, SileroVADService
 
-__all__ = ['SileroVAD']
+__all__ = ['SileroVAD', 'SileroVADBatch', 'SileroVADMultiChannel', 'SileroVADPool', 'SpeechSegmenter', 'get_speech_timestamps', 'SileroVADService', 'AsyncSileroVADService']
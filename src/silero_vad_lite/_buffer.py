@@ -0,0 +1,151 @@
+import array
+import ctypes
+import sys
+import threading
+
+# Buffer request flags, from the CPython buffer protocol (https://docs.python.org/3/c-api/buffer.html)
+_PyBUF_WRITABLE = 0x0001
+_PyBUF_FORMAT = 0x0004
+_PyBUF_C_CONTIGUOUS = 0x0038
+
+# Struct format prefixes that denote native byte order, for buffers with multi-byte items
+_NATIVE_BYTE_ORDER_PREFIXES = ('@', '=', '<' if sys.byteorder == 'little' else '>')
+
+class _Py_buffer(ctypes.Structure):
+    _fields_ = [
+        ('buf', ctypes.c_void_p),
+        ('obj', ctypes.c_void_p),
+        ('len', ctypes.c_ssize_t),
+        ('itemsize', ctypes.c_ssize_t),
+        ('readonly', ctypes.c_int),
+        ('ndim', ctypes.c_int),
+        ('format', ctypes.c_char_p),
+        ('shape', ctypes.c_void_p),
+        ('strides', ctypes.c_void_p),
+        ('suboffsets', ctypes.c_void_p),
+        ('internal', ctypes.c_void_p),
+    ]
+
+# Get our own function objects, rather than setting the prototypes on those shared through `ctypes.pythonapi`. It is not available on all implementations (such as PyPy), in which case views are taken through `memoryview` instead.
+try:
+    _PyObject_GetBuffer = ctypes.pythonapi['PyObject_GetBuffer']
+    _PyObject_GetBuffer.argtypes = [ctypes.py_object, ctypes.c_void_p, ctypes.c_int]
+    _PyObject_GetBuffer.restype = ctypes.c_int
+
+    _PyBuffer_Release = ctypes.pythonapi['PyBuffer_Release']
+    _PyBuffer_Release.argtypes = [ctypes.c_void_p]
+    _PyBuffer_Release.restype = None
+except (AttributeError, OSError):
+    _PyObject_GetBuffer = _PyBuffer_Release = None
+
+class _Buffer:
+    """
+    A reusable view of the memory of an object supporting the buffer protocol (such as `bytes`, `bytearray`, `memoryview`, `array.array`, `ctypes.Array`, or `numpy.ndarray`), whose address can be passed directly to the native library, without copying the data or creating any `ctypes` objects per call. If it is already in use (e.g. by another thread), a temporary view is created for the call instead.
+
+    Use it as a context manager, which holds the view (keeping the memory valid) until the end of the block:
+
+        with buffer.acquire(data, 4, 'f') as (address, length):
+            ...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Held while the view is acquired
+        self._view = _Py_buffer()
+        self._view_ref = ctypes.byref(self._view)
+        self._acquired = False
+        self._fallback_refs = None  # The memoryview and ctypes array keeping the memory valid, when taken through `memoryview`
+        self._address = None
+        self._length = 0
+
+    def acquire(self, data, itemsize, typecodes, writable=False):
+        """
+        Acquires a view of the data, as contiguous samples of the given item size and one of the given typecodes (the first of which is used to convert sequences such as lists). Any buffer of bytes is also accepted, reinterpreted as samples.
+
+        Raises:
+            ValueError: If the data is empty, is not contiguous (or writable, if required), or its samples are of the wrong type or size.
+            TypeError: If the data does not support the buffer protocol and is not a sequence of numbers.
+        """
+        if not self._lock.acquire(blocking=False):
+            return _Buffer().acquire(data, itemsize, typecodes, writable)
+        try:
+            if _PyObject_GetBuffer is not None:
+                self._get_view(data, itemsize, typecodes, writable)
+            else:
+                self._get_memoryview(data, itemsize, typecodes, writable)
+        except BaseException:
+            self._lock.release()
+            raise
+        return self
+
+    def _get_view(self, data, itemsize, typecodes, writable):
+        name = "Output buffer" if writable else "Data"
+        flags = _PyBUF_C_CONTIGUOUS | _PyBUF_FORMAT | (_PyBUF_WRITABLE if writable else 0)
+        try:
+            try:
+                _PyObject_GetBuffer(data, self._view_ref, flags)
+            except TypeError:
+                if writable:
+                    raise
+                # Not a buffer, so convert a sequence such as a list or tuple
+                _PyObject_GetBuffer(array.array(typecodes[0], data), self._view_ref, flags)
+        except BufferError as e:
+            raise ValueError(f"{name} must be contiguous" + (" and writable" if writable else "")) from e
+        self._acquired = True
+
+        try:
+            view = self._view
+            _check_samples(name, (view.format or b'B').decode('ascii'), view.itemsize, view.len, itemsize, typecodes)
+        except BaseException:
+            self._release_view()
+            raise
+        self._address = view.buf
+        self._length = view.len // itemsize
+
+    def _get_memoryview(self, data, itemsize, typecodes, writable):
+        name = "Output buffer" if writable else "Data"
+        try:
+            view = memoryview(data)
+        except TypeError:
+            if writable:
+                raise
+            # Not a buffer, so convert a sequence such as a list or tuple
+            view = memoryview(array.array(typecodes[0], data))
+        if not view.c_contiguous or (writable and view.readonly):
+            raise ValueError(f"{name} must be contiguous" + (" and writable" if writable else ""))
+        _check_samples(name, view.format, view.itemsize, view.nbytes, itemsize, typecodes)
+        # The address of read-only memory cannot be taken through `ctypes`, so it is copied
+        memory_type = ctypes.c_char * view.nbytes
+        memory = memory_type.from_buffer_copy(view) if view.readonly else memory_type.from_buffer(view)
+        self._fallback_refs = (view, memory)
+        self._address = ctypes.addressof(memory)
+        self._length = view.nbytes // itemsize
+
+    def _release_view(self):
+        if self._acquired:
+            self._acquired = False
+            _PyBuffer_Release(self._view_ref)
+        self._fallback_refs = None
+
+    def release(self):
+        if self._lock.locked():
+            self._release_view()
+            self._lock.release()
+
+    def __enter__(self):
+        return self._address, self._length
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+def _check_samples(name, typecode, view_itemsize, view_len, itemsize, typecodes):
+    if view_itemsize == 1 and typecode in ('B', 'b', 'c'):
+        # Raw bytes, reinterpreted as samples
+        if view_len % itemsize != 0:
+            raise ValueError(f"{name} length must be a multiple of the size of a sample ({itemsize} bytes)")
+    else:
+        if view_itemsize > 1 and typecode[:1] in _NATIVE_BYTE_ORDER_PREFIXES:
+            typecode = typecode[1:]
+        if view_itemsize != itemsize or typecode not in typecodes:
+            raise ValueError(f"{name} must consist of samples of type '{typecodes[0]}' ({itemsize} bytes), not '{typecode}' ({view_itemsize} bytes)")
+    if view_len <= 0:
+        raise ValueError(f"{name} must not be empty")
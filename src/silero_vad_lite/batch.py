@@ -0,0 +1,289 @@
+import array
+import ctypes
+
+from ._buffer import _Buffer
+from .silero_vad import _FLOAT32_SIZE, _FLOAT32_TYPECODES, _SAMPLE_FORMATS, SileroVAD, _load_lib, _make_session_config
+
+class SileroVADBatch:
+
+    def __init__(self, sample_rate, model_path=None, **session_options):
+        """
+        Initializes the SileroVADBatch object, which runs the Silero VAD model for many independent audio streams at once, processing one window from each of them in a single batched model run. It shares its ONNX Runtime session with any SileroVAD objects using the same model.
+
+        Args:
+            sample_rate (int): The sample rate of the audio, for all streams.
+            model_path (str, optional): The path to the model file. If not provided, the default model included in the package will be used.
+            **session_options: Options for the ONNX Runtime session, as for `SileroVAD`.
+
+        Returns:
+            SileroVADBatch: The SileroVADBatch object.
+        """
+        if model_path is None:
+            model_path = SileroVAD._get_model_path()
+        session_config = _make_session_config(**session_options)
+
+        self._lib = _load_lib()
+
+        # Create the C++ object
+        self._obj = self._lib.SileroVADBatch_new(model_path.encode('utf-8'), sample_rate, ctypes.byref(session_config))
+        if not self._obj:
+            raise RuntimeError("Failed to create SileroVADBatch")
+        self._sample_rate = sample_rate  # Constant
+        self._window_size_samples = self._lib.SileroVADBatch_get_window_size_samples(self._obj)  # Constant
+        self._stream_ids = set()
+        self._data_buffer = _Buffer()
+        self._out_buffer = _Buffer()
+
+    def __del__(self):
+        """
+        Destructor method for the SileroVADBatch object.
+        """
+        if hasattr(self, '_obj'):
+            self._lib.SileroVADBatch_delete(self._obj)
+            del self._obj
+
+    @property
+    def sample_rate(self):
+        """
+        Returns the sample rate of the audio.
+
+        Returns:
+            int: The sample rate of the audio.
+        """
+        return self._sample_rate
+
+    @property
+    def window_size_samples(self):
+        """
+        Returns the window size in samples, per stream.
+
+        Returns:
+            int: The window size in samples.
+        """
+        return self._window_size_samples
+
+    @property
+    def stream_ids(self):
+        """
+        Returns the ids of the streams currently in the batch.
+
+        Returns:
+            list: The ids of the active streams, in ascending order.
+        """
+        return sorted(self._stream_ids)
+
+    def add_stream(self):
+        """
+        Adds a new stream with a fresh model state. The ids of removed streams may be reused.
+
+        Returns:
+            int: The id of the new stream.
+        """
+        stream_id = self._lib.SileroVADBatch_add_stream(self._obj)
+        self._stream_ids.add(stream_id)
+        return stream_id
+
+    def remove_stream(self, stream_id):
+        """
+        Removes a stream, discarding its model state.
+
+        Args:
+            stream_id (int): The id of the stream to remove.
+
+        Raises:
+            ValueError: If the stream id is not in the batch.
+        """
+        if stream_id not in self._stream_ids:
+            raise ValueError(f"Invalid stream id: {stream_id}")
+        if self._lib.SileroVADBatch_remove_stream(self._obj, stream_id) != 0:
+            raise RuntimeError("Failed to remove stream")
+        self._stream_ids.remove(stream_id)
+
+    def process(self, stream_ids, data, out=None):
+        """
+        Process one window of input data for each of the given streams in a single batched model run, and return the VAD score for each stream.
+
+        Any subset of the streams in the batch may be given, in any order, so streams that do not yet have a full window of audio available can simply be left out of the call.
+
+        Args:
+            stream_ids (list): The ids of the streams to process, each at most once.
+            data: The input data to be processed: the windows for the given streams, concatenated in the same order as `stream_ids`. It supports the same types and audio format as `SileroVAD.process`, and its length in samples must be exactly the number of streams times the window size.
+            out (optional): A writable buffer of 32-bit floats to store the VAD scores in, with room for at least one score per stream, as for `SileroVAD.process_many`. If not provided, a new `array.array` is allocated.
+
+        Returns:
+            The buffer containing the VAD scores, in the same order as `stream_ids`: `out` if provided, otherwise a new `array.array` of type 'f'.
+
+        Raises:
+            ValueError: If a stream id is invalid or repeated, if the data is empty, has an invalid length, or is not contiguous or of an unsupported sample type, or if the output buffer is too small, not writable, or of an unsupported type.
+            TypeError: If the data is not a buffer or a sequence of numbers, or the output buffer is not a buffer.
+        """
+        num_streams = len(stream_ids)
+        if num_streams <= 0:
+            raise ValueError("At least one stream id must be given")
+        if len(set(stream_ids)) != num_streams:
+            raise ValueError("Each stream id may only be given once")
+        for stream_id in stream_ids:
+            if stream_id not in self._stream_ids:
+                raise ValueError(f"Invalid stream id: {stream_id}")
+        stream_id_array = (ctypes.c_int64 * num_streams)(*stream_ids)
+        with self._data_buffer.acquire(data, _FLOAT32_SIZE, _FLOAT32_TYPECODES) as (address, length):
+            if length != num_streams * self._window_size_samples:
+                raise ValueError(f"Data length must be equal to the number of streams times the window size ({num_streams} * {self._window_size_samples})")
+            if out is None:
+                out = array.array('f', bytes(num_streams * _FLOAT32_SIZE))
+            with self._out_buffer.acquire(out, _FLOAT32_SIZE, _FLOAT32_TYPECODES, writable=True) as (out_address, out_length):
+                if out_length < num_streams:
+                    raise ValueError(f"Output buffer must have room for at least {num_streams} scores")
+                if self._lib.SileroVADBatch_process(self._obj, stream_id_array, num_streams, address, length, out_address) != 0:
+                    raise RuntimeError("Failed to process data")
+        return out
+
+class SileroVADMultiChannel:
+
+    def __init__(self, sample_rate, num_channels, model_path=None, input_format='float32', input_sample_rate=None, **session_options):
+        """
+        Initializes the SileroVADMultiChannel object, which runs the Silero VAD model over interleaved multi-channel audio (such as a stereo or conference call recording), keeping a separate model state for each channel. The audio is deinterleaved natively, and each window of all channels is processed in a single batched model run, using one model session shared with any other objects using the same model.
+
+        Args:
+            sample_rate (int): The sample rate for the model (8000 or 16000).
+            num_channels (int): The number of interleaved channels.
+            model_path (str, optional): The path to the model file. If not provided, the default model included in the package will be used.
+            input_format (str, optional): The format of the PCM samples passed to `feed`, as for `SileroVAD`.
+            input_sample_rate (int, optional): The sample rate of the audio passed to `feed`, if different from `sample_rate`, as for `SileroVAD`. Each channel is resampled natively.
+            **session_options: Options for the ONNX Runtime session, as for `SileroVAD`.
+
+        Returns:
+            SileroVADMultiChannel: The SileroVADMultiChannel object.
+        """
+        if model_path is None:
+            model_path = SileroVAD._get_model_path()
+        if num_channels <= 0:
+            raise ValueError("Number of channels must be positive")
+        if input_format not in _SAMPLE_FORMATS:
+            raise ValueError(f"Input format must be one of: {', '.join(_SAMPLE_FORMATS)}")
+        if input_sample_rate is None:
+            input_sample_rate = sample_rate
+        session_config = _make_session_config(**session_options)
+
+        self._lib = _load_lib()
+
+        # Create the C++ object
+        self._obj = self._lib.SileroVADMultiChannel_new(model_path.encode('utf-8'), sample_rate, num_channels, ctypes.byref(session_config))
+        if not self._obj:
+            raise RuntimeError("Failed to create SileroVADMultiChannel")
+        self._sample_rate = sample_rate  # Constant
+        self._num_channels = num_channels  # Constant
+        self._window_size_samples = self._lib.SileroVADMultiChannel_get_window_size_samples(self._obj)  # Constant
+        self._data_buffer = _Buffer()
+        self._feed_capacity = 0
+
+        format_id, self._input_sample_size, self._input_typecodes = _SAMPLE_FORMATS[input_format]
+        if self._lib.SileroVADMultiChannel_set_input(self._obj, format_id, input_sample_rate) != 0:
+            raise ValueError(f"Unsupported input sample rate: {input_sample_rate}")
+        self._input_format = input_format  # Constant
+        self._input_sample_rate = input_sample_rate  # Constant
+
+    def __del__(self):
+        """
+        Destructor method for the SileroVADMultiChannel object.
+        """
+        if hasattr(self, '_obj'):
+            self._lib.SileroVADMultiChannel_delete(self._obj)
+            del self._obj
+
+    @property
+    def sample_rate(self):
+        """
+        Returns the sample rate for the model.
+
+        Returns:
+            int: The sample rate for the model.
+        """
+        return self._sample_rate
+
+    @property
+    def num_channels(self):
+        """
+        Returns the number of interleaved channels.
+
+        Returns:
+            int: The number of channels.
+        """
+        return self._num_channels
+
+    @property
+    def window_size_samples(self):
+        """
+        Returns the window size in samples, per channel.
+
+        Returns:
+            int: The window size in samples.
+        """
+        return self._window_size_samples
+
+    @property
+    def input_format(self):
+        """
+        Returns the format of the PCM samples passed to `feed`.
+
+        Returns:
+            str: The input sample format.
+        """
+        return self._input_format
+
+    @property
+    def input_sample_rate(self):
+        """
+        Returns the sample rate of the audio passed to `feed`.
+
+        Returns:
+            int: The input sample rate.
+        """
+        return self._input_sample_rate
+
+    @property
+    def pending_samples(self):
+        """
+        Returns the number of samples per channel fed with `feed` that are buffered, waiting for a complete window, at the model sample rate.
+
+        Returns:
+            int: The number of buffered samples per channel, always less than the window size.
+        """
+        return self._lib.SileroVADMultiChannel_get_pending_samples(self._obj)
+
+    def feed(self, data):
+        """
+        Feed the next interleaved input data of the stream, of any number of frames, and return the VAD scores of each channel for each window completed by it.
+
+        Args:
+            data: The input data to be processed. It supports the same types as `SileroVAD.feed`, and must consist of interleaved PCM audio samples (one sample of each channel per frame) in the input format and at the input sample rate specified during initialization. Its length in samples must be a multiple of the number of channels.
+
+        Returns:
+            list: The results, as tuples of `(offset, scores)`, where `offset` is the offset of the start of the window from the start of the stream in samples per channel (at the model sample rate), and `scores` is a list of the VAD score of each channel for the window.
+
+        Raises:
+            ValueError: If the data has an invalid length, or is not contiguous or of an unsupported sample type.
+            TypeError: If the data is not a buffer or a sequence of numbers.
+        """
+        if len(data) == 0:
+            return []
+        with self._data_buffer.acquire(data, self._input_sample_size, self._input_typecodes) as (address, length):
+            if length % self._num_channels != 0:
+                raise ValueError(f"Data length must be a multiple of the number of channels ({self._num_channels})")
+            num_frames = length // self._num_channels
+            max_windows = (num_frames * self._sample_rate // self._input_sample_rate + 1) // self._window_size_samples + 1
+            if self._feed_capacity < max_windows:
+                self._feed_capacity = max_windows
+                self._feed_scores = (ctypes.c_float * (max_windows * self._num_channels))()
+                self._feed_offsets = (ctypes.c_int64 * max_windows)()
+            num_windows = self._lib.SileroVADMultiChannel_feed(self._obj, address, num_frames, self._feed_scores, self._feed_offsets, self._feed_capacity)
+        if num_windows < 0:
+            raise RuntimeError("Failed to process data")
+        scores = self._feed_scores[:num_windows * self._num_channels]
+        return [(offset, scores[i * self._num_channels:(i + 1) * self._num_channels]) for i, offset in enumerate(self._feed_offsets[:num_windows])]
+
+    def reset(self):
+        """
+        Reset the object to the start of a new stream, without reloading the model: clears the model state of each channel, any buffered samples (and the resampler history), and the sample offset.
+        """
+        self._lib.SileroVADMultiChannel_reset(self._obj)
@@ -0,0 +1,279 @@
+import argparse
+import collections
+import csv
+import io
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+
+from .segmenter import SpeechSegmenter
+from .silero_vad import SileroVAD
+
+# WAV format tags, mapped with the sample width in bits to the SileroVAD input format
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_WAV_INPUT_FORMATS = {
+    (_WAVE_FORMAT_PCM, 8): 'uint8',
+    (_WAVE_FORMAT_PCM, 16): 'int16',
+    (_WAVE_FORMAT_PCM, 32): 'int32',
+    (_WAVE_FORMAT_IEEE_FLOAT, 32): 'float32',
+    (_WAVE_FORMAT_IEEE_FLOAT, 64): 'float64',
+}
+
+# Number of input samples fed to the model at once, to bound the memory used for results
+_FEED_CHUNK_SAMPLES = 1 << 20
+
+_WavInfo = collections.namedtuple('_WavInfo', ['input_format', 'num_channels', 'sample_rate', 'block_align', 'data_offset', 'num_samples'])
+
+def _read_wav_info(buffer):
+    """
+    Parses the RIFF header of a WAV file, returning the format of its samples and the location of its data.
+
+    Args:
+        buffer: The contents of the file, such as an `mmap.mmap`.
+
+    Returns:
+        _WavInfo: The input format, number of channels, sample rate, size of a frame (one sample per channel) in bytes, offset of the data in bytes, and number of frames.
+
+    Raises:
+        ValueError: If the file is not a WAV file, or its sample format is unsupported.
+    """
+    if len(buffer) < 12 or buffer[0:4] != b'RIFF' or buffer[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF WAVE file")
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = bytes(buffer[offset:offset + 4])
+        chunk_size, = struct.unpack_from('<I', buffer, offset + 4)
+        chunk_offset = offset + 8
+        if chunk_id == b'fmt ':
+            if chunk_size < 16:
+                raise ValueError("Invalid fmt chunk")
+            format_tag, num_channels, sample_rate, _, block_align, bits_per_sample = struct.unpack_from('<HHIIHH', buffer, chunk_offset)
+            if format_tag == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                format_tag, = struct.unpack_from('<H', buffer, chunk_offset + 24)  # The first two bytes of the subformat GUID
+            fmt = (format_tag, num_channels, sample_rate, block_align, bits_per_sample)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("Missing fmt chunk before data chunk")
+            format_tag, num_channels, sample_rate, block_align, bits_per_sample = fmt
+            input_format = _WAV_INPUT_FORMATS.get((format_tag, bits_per_sample))
+            if input_format is None:
+                raise ValueError(f"Unsupported sample format: format tag {format_tag:#06x} with {bits_per_sample} bits per sample")
+            if num_channels <= 0 or block_align != num_channels * bits_per_sample // 8:
+                raise ValueError("Invalid block alignment")
+            data_size = min(chunk_size, len(buffer) - chunk_offset)  # The size may be wrong in files that were not finalized
+            return _WavInfo(input_format, num_channels, sample_rate, block_align, chunk_offset, data_size // block_align)
+        offset = chunk_offset + chunk_size + (chunk_size & 1)  # Chunks are padded to an even size
+    raise ValueError("Missing data chunk")
+
+def _scan_file(path, options):
+    """
+    Runs the model over a WAV file, returning its speech segments or window probabilities, with times in seconds.
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        info = _read_wav_info(buffer)
+        if info.num_channels != 1:
+            raise ValueError(f"Only mono audio is supported, not {info.num_channels} channels")
+        if sys.byteorder != 'little' and info.input_format != 'uint8':
+            raise ValueError("Multi-byte samples are only supported on little-endian platforms")
+        vad = _get_worker_vad(options, info.input_format, info.sample_rate)
+        vad.reset()
+        segmenter = SpeechSegmenter(vad, **options['segmenter_options']) if options['mode'] == 'segments' else None
+        results = []
+        # Views of the file must all be released before it is unmapped
+        with memoryview(buffer)[info.data_offset:info.data_offset + info.num_samples * info.block_align] as data:
+            for start in range(0, info.num_samples, _FEED_CHUNK_SAMPLES):
+                with data[start * info.block_align:(start + _FEED_CHUNK_SAMPLES) * info.block_align] as chunk:
+                    results += segmenter.process(chunk) if segmenter else vad.feed(chunk)
+        if segmenter:
+            results += segmenter.flush()
+            # Events alternate between starts and ends, beginning with a start
+            return [(start / vad.sample_rate, end / vad.sample_rate) for (_, start), (_, end) in zip(results[0::2], results[1::2])]
+        return [(offset / vad.sample_rate, score) for offset, score in results]
+
+_worker_options = None
+_worker_vads = {}
+
+def _init_worker(options):
+    global _worker_options
+    _worker_options = options
+    _worker_vads.clear()  # Objects created for the options of a previous run (in this process) must not be reused
+
+def _get_worker_vad(options, input_format, input_sample_rate):
+    """
+    Returns the SileroVAD of this worker for the given options and input format, creating it on first use. All of them share the model session of the worker.
+    """
+    key = (options['sample_rate'], options['intra_op_num_threads'], input_format, input_sample_rate)
+    if key not in _worker_vads:
+        _worker_vads[key] = SileroVAD(options['sample_rate'], input_format=input_format, input_sample_rate=input_sample_rate, intra_op_num_threads=options['intra_op_num_threads'])
+    return _worker_vads[key]
+
+def _process_path(path):
+    try:
+        return path, _scan_file(path, _worker_options), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+def _find_wav_files(inputs):
+    """
+    Returns the absolute paths of the given WAV files, and of the WAV files found recursively in the given directories, in sorted order.
+    """
+    paths = set()
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            for dir_path, _, file_names in os.walk(input_path):
+                paths.update(os.path.join(dir_path, file_name) for file_name in file_names if file_name.lower().endswith('.wav'))
+        else:
+            paths.add(input_path)
+    return sorted(os.path.abspath(path) for path in paths)
+
+def _format_result(path, result, output_format, mode):
+    """
+    Returns the output text for the result of a file.
+    """
+    if output_format == 'jsonl':
+        if mode == 'segments':
+            record = dict(path=path, segments=[dict(start=round(start, 4), end=round(end, 4)) for start, end in result])
+        else:
+            record = dict(path=path, probabilities=[dict(time=round(time, 4), probability=round(score, 6)) for time, score in result])
+        return json.dumps(record) + '\n'
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator='\n')
+    if mode == 'segments':
+        writer.writerows((path, f'{start:.4f}', f'{end:.4f}') for start, end in result)
+    else:
+        writer.writerows((path, f'{time:.4f}', f'{score:.6f}') for time, score in result)
+    return text.getvalue()
+
+def _format_header(output_format, mode):
+    if output_format != 'csv':
+        return ''
+    return 'path,start,end\n' if mode == 'segments' else 'path,time,probability\n'
+
+class _Progress:
+    """
+    A sidecar file recording which input files have been completely written to the output, for resuming an interrupted run.
+
+    Each line is `offset<TAB>path`, where `offset` is the size of the output after the results of `path` were written. On resume, the output is truncated to the last recorded offset, discarding any partially written results, and the recorded files are skipped.
+    """
+
+    def __init__(self, output_path):
+        self.path = output_path + '.progress'
+
+    def load(self):
+        """
+        Returns the recorded output size and the set of completed paths, or `(0, set())` if there is no progress file.
+        """
+        offset, done = 0, set()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        break  # Partially written line
+                    line_offset, _, path = line.rstrip('\n').partition('\t')
+                    offset = int(line_offset)
+                    done.add(path)
+        except FileNotFoundError:
+            pass
+        return offset, done
+
+    def open(self, truncate):
+        self._file = open(self.path, 'w' if truncate else 'a', encoding='utf-8')
+
+    def record(self, offset, path):
+        self._file.write(f'{offset}\t{path}\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m silero_vad_lite', description="Run Silero VAD over WAV files in parallel, writing speech segments or per-window speech probabilities.")
+    parser.add_argument('inputs', nargs='+', help="WAV files, or directories to search recursively for WAV files")
+    parser.add_argument('-o', '--output', default='-', help="Path of the output file (default: stdout)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl', help="Output format (default: jsonl)")
+    parser.add_argument('-m', '--mode', choices=['segments', 'probabilities'], default='segments', help="Whether to output speech segments or the speech probability of each window (default: segments)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument('--resume', action='store_true', help="Resume an interrupted run, skipping files already written to the output (requires --output)")
+    parser.add_argument('--sample-rate', type=int, choices=[8000, 16000], default=16000, help="Sample rate to run the model at; audio at other rates is resampled (default: 16000)")
+    parser.add_argument('--intra-op-threads', type=int, default=1, help="Number of threads per worker for the model (default: 1)")
+    parser.add_argument('--threshold', type=float, default=0.5, help="Speech probability threshold for segments (default: 0.5)")
+    parser.add_argument('--neg-threshold', type=float, default=None, help="Silence probability threshold for segments (default: threshold - 0.15)")
+    parser.add_argument('--min-speech-ms', type=float, default=250, help="Minimum duration of a segment (default: 250)")
+    parser.add_argument('--min-silence-ms', type=float, default=100, help="Minimum duration of silence to end a segment (default: 100)")
+    parser.add_argument('--speech-pad-ms', type=float, default=30, help="Padding added to both sides of each segment (default: 30)")
+    parser.add_argument('--max-speech-s', type=float, default=math.inf, help="Maximum duration of a segment (default: unlimited)")
+    args = parser.parse_args(argv)
+    if args.resume and args.output == '-':
+        parser.error("--resume requires --output")
+    if args.workers <= 0:
+        parser.error("--workers must be positive")
+    return args
+
+def main(argv=None):
+    """
+    Runs the command-line scanner, returning the exit status: 0 on success, or 1 if any file failed.
+
+    Args:
+        argv (list, optional): The command-line arguments. If not provided, `sys.argv[1:]` is used.
+    """
+    args = _parse_args(argv)
+    options = dict(
+        mode=args.mode,
+        sample_rate=args.sample_rate,
+        intra_op_num_threads=args.intra_op_threads,
+        segmenter_options=dict(threshold=args.threshold, neg_threshold=args.neg_threshold, min_speech_duration_ms=args.min_speech_ms, min_silence_duration_ms=args.min_silence_ms, speech_pad_ms=args.speech_pad_ms, max_speech_duration_s=args.max_speech_s),
+    )
+    paths = _find_wav_files(args.inputs)
+
+    progress = None
+    if args.output == '-':
+        output = sys.stdout
+        output.write(_format_header(args.format, args.mode))
+    else:
+        progress = _Progress(args.output)
+        offset, done = progress.load() if args.resume else (0, set())
+        paths = [path for path in paths if path not in done]
+        output = open(args.output, 'r+b' if offset > 0 else 'wb')
+        output.truncate(offset)
+        output.seek(offset)
+        progress.open(truncate=offset == 0)
+        if offset == 0:
+            output.write(_format_header(args.format, args.mode).encode('utf-8'))
+
+    num_errors = 0
+    pool = multiprocessing.Pool(min(args.workers, max(len(paths), 1)), initializer=_init_worker, initargs=(options,)) if args.workers > 1 else None
+    try:
+        if pool:
+            results = pool.imap_unordered(_process_path, paths)
+        else:
+            _init_worker(options)
+            results = map(_process_path, paths)
+        for path, result, error in results:
+            if error is not None:
+                print(f"Error processing {path}: {error}", file=sys.stderr)
+                num_errors += 1
+                continue
+            text = _format_result(path, result, args.format, args.mode)
+            if progress:
+                output.write(text.encode('utf-8'))
+                output.flush()
+                progress.record(output.tell(), path)
+            else:
+                output.write(text)
+        if pool:
+            pool.close()
+            pool.join()
+    finally:
+        if pool:
+            pool.terminate()
+        if progress:
+            output.close()
+            progress.close()
+    return 1 if num_errors else 0
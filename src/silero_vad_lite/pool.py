@@ -0,0 +1,146 @@
+import contextlib
+import queue
+import threading
+
+from .silero_vad import _SAMPLE_FORMATS, SileroVAD
+
+class SileroVADPool:
+
+    def __init__(self, sample_rate, size=1, max_size=None, **vad_kwargs):
+        """
+        Initializes the SileroVADPool object, which hands out pre-warmed SileroVAD objects and resets them when they are returned, so short streams (e.g. calls or utterances) can reuse them instead of creating new ones.
+
+        Args:
+            sample_rate (int): The sample rate of the audio, for all objects.
+            size (int, optional): The number of objects to create (and warm up, by running the model once) up front.
+            max_size (int, optional): The maximum number of objects to create, after which `acquire` waits for one to be released. If not provided, it is unlimited.
+            **vad_kwargs: Any other arguments for the SileroVAD objects, such as `input_format` or session options.
+
+        Returns:
+            SileroVADPool: The SileroVADPool object.
+        """
+        if size < 0:
+            raise ValueError("Size must not be negative")
+        if max_size is not None and max_size < max(size, 1):
+            raise ValueError("Maximum size must be positive and at least the size")
+        self._sample_rate = sample_rate
+        self._max_size = max_size
+        self._vad_kwargs = vad_kwargs
+        self._lock = threading.Lock()
+        self._num_created = size
+        self._idle = queue.LifoQueue()  # Reuse the most recently used objects, which are most likely to be in cache
+        self._acquired = set()  # Objects currently checked out, which are the only ones that can be released
+        for _ in range(size):
+            self._idle.put(self._create())
+
+    @property
+    def sample_rate(self):
+        """
+        Returns the sample rate of the audio.
+
+        Returns:
+            int: The sample rate of the audio.
+        """
+        return self._sample_rate
+
+    @property
+    def num_created(self):
+        """
+        Returns the number of objects created by the pool.
+
+        Returns:
+            int: The number of objects created.
+        """
+        return self._num_created
+
+    @property
+    def num_idle(self):
+        """
+        Returns the number of objects in the pool that are not currently acquired.
+
+        Returns:
+            int: The number of idle objects.
+        """
+        return self._idle.qsize()
+
+    def acquire(self, block=True, timeout=None):
+        """
+        Acquires a SileroVAD object, ready to process a new stream. An idle object is reused if there is one, otherwise a new one is created, unless `max_size` objects have been created already, in which case this waits for one to be released.
+
+        Args:
+            block (bool, optional): Whether to wait for an object to be released if necessary. If False, `queue.Empty` is raised instead.
+            timeout (float, optional): The maximum time to wait for an object to be released, after which `queue.Empty` is raised. If not provided, waits indefinitely.
+
+        Returns:
+            SileroVAD: The acquired object, which should be returned with `release` when the stream ends.
+
+        Raises:
+            queue.Empty: If no object is available, and `block` is False or the timeout expires.
+        """
+        try:
+            vad = self._idle.get(block=False)
+        except queue.Empty:
+            with self._lock:
+                can_create = self._max_size is None or self._num_created < self._max_size
+                if can_create:
+                    self._num_created += 1
+            if can_create:
+                try:
+                    vad = self._create()
+                except BaseException:
+                    with self._lock:
+                        self._num_created -= 1
+                    raise
+            else:
+                vad = self._idle.get(block=block, timeout=timeout)
+        with self._lock:
+            self._acquired.add(vad)
+        return vad
+
+    def release(self, vad):
+        """
+        Returns a SileroVAD object acquired from the pool, resetting it for the next stream.
+
+        Args:
+            vad (SileroVAD): The object to return.
+
+        Raises:
+            ValueError: If the object is not currently acquired from this pool (e.g. it was already released).
+        """
+        with self._lock:
+            if vad not in self._acquired:
+                raise ValueError("Object is not currently acquired from this pool")
+            self._acquired.remove(vad)
+        vad.reset()
+        self._idle.put(vad)
+
+    @contextlib.contextmanager
+    def borrow(self, block=True, timeout=None):
+        """
+        Acquires a SileroVAD object for the duration of a `with` block, releasing it afterwards.
+
+        Args:
+            block (bool, optional): As for `acquire`.
+            timeout (float, optional): As for `acquire`.
+
+        Yields:
+            SileroVAD: The acquired object.
+        """
+        vad = self.acquire(block=block, timeout=timeout)
+        try:
+            yield vad
+        finally:
+            self.release(vad)
+
+    def _create(self):
+        vad = SileroVAD(self._sample_rate, **self._vad_kwargs)
+        # Warm up by running the model (through the converter and resampler, if any), so the first real window does not pay for any lazy initialization. The silent windows would be skipped by an energy gate, so it is disabled meanwhile, and the warm-up is not counted in the stats.
+        energy_gate = vad.energy_gate
+        vad.set_energy_gate(None)
+        input_sample_size = _SAMPLE_FORMATS[vad.input_format][1]
+        vad.feed(bytearray(2 * vad.window_size_samples * vad.input_sample_rate // vad.sample_rate * input_sample_size))
+        if energy_gate is not None:
+            vad.set_energy_gate(**energy_gate)
+        vad.reset()
+        vad.reset_stats()
+        return vad
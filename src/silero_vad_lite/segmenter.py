@@ -0,0 +1,150 @@
+import ctypes
+import math
+
+from ._buffer import _Buffer
+from .silero_vad import _FLOAT32_SIZE, _FLOAT32_TYPECODES, SileroVAD, _load_lib
+
+class _SegmentEvent(ctypes.Structure):
+    _fields_ = [('sample', ctypes.c_int64), ('type', ctypes.c_int32)]
+
+_SEGMENT_EVENT_TYPES = {0: 'end', 1: 'start'}
+
+class SpeechSegmenter:
+
+    def __init__(self, vad, threshold=0.5, neg_threshold=None, min_speech_duration_ms=250, min_silence_duration_ms=100, speech_pad_ms=30, max_speech_duration_s=math.inf):
+        """
+        Initializes the SpeechSegmenter object, which incrementally segments a stream of audio into speech segments, emitting start and end events as the audio is processed. The thresholding is done natively, for each window, as the audio is run through the model.
+
+        Args:
+            vad (SileroVAD): The SileroVAD object to run the model with. Audio is fed to it with `SileroVAD.feed`, so it should not be used for anything else concurrently.
+            threshold (float, optional): The VAD score at or above which a window is considered speech.
+            neg_threshold (float, optional): The VAD score below which a window is considered silence; windows scoring in between continue the current state. If not provided, it is set to `threshold - 0.15` (but at least 0.01).
+            min_speech_duration_ms (int, optional): The minimum duration of speech before a segment is started.
+            min_silence_duration_ms (int, optional): The minimum duration of silence before a segment is ended.
+            speech_pad_ms (int, optional): The padding added to both sides of each segment (limited to not overlap the previous segment).
+            max_speech_duration_s (float, optional): The maximum duration of a segment (including padding): a segment is ended at the last window boundary before it would exceed it (or at the limit itself, if it already would), and (if speech continues) a new segment is started immediately.
+
+        Returns:
+            SpeechSegmenter: The SpeechSegmenter object.
+        """
+        if neg_threshold is None:
+            neg_threshold = max(threshold - 0.15, 0.01)
+        if not 0 <= neg_threshold <= threshold <= 1:
+            raise ValueError("Thresholds must satisfy 0 <= neg_threshold <= threshold <= 1")
+        samples_per_ms = vad.sample_rate / 1000
+        max_speech_samples = 0 if math.isinf(max_speech_duration_s) else int(max_speech_duration_s * 1000 * samples_per_ms)
+
+        self._lib = _load_lib()
+        self._vad = vad  # Keep a reference, to keep the C++ object alive
+        self._window_size_samples = vad.window_size_samples
+        self._events = (_SegmentEvent * 3)()
+        self._scores_buffer = _Buffer()
+
+        # Create the C++ object
+        self._obj = self._lib.SpeechSegmenter_new(vad._obj, threshold, neg_threshold, int(min_speech_duration_ms * samples_per_ms), int(min_silence_duration_ms * samples_per_ms), int(speech_pad_ms * samples_per_ms), max_speech_samples)
+        if not self._obj:
+            raise RuntimeError("Failed to create SpeechSegmenter")
+
+    def __del__(self):
+        """
+        Destructor method for the SpeechSegmenter object.
+        """
+        if hasattr(self, '_obj'):
+            self._lib.SpeechSegmenter_delete(self._obj)
+            del self._obj
+
+    @property
+    def vad(self):
+        """
+        Returns the SileroVAD object used by the segmenter.
+
+        Returns:
+            SileroVAD: The SileroVAD object.
+        """
+        return self._vad
+
+    def process(self, data):
+        """
+        Process the next input data of the stream, and return the segment events it produces.
+
+        Args:
+            data: The input data to be processed. It is fed to the SileroVAD with `SileroVAD.feed`, so it supports the same types and audio formats, and can be of any length.
+
+        Returns:
+            list: The events, as tuples of `(event, sample)`, where `event` is either `'start'` or `'end'` and `sample` is the offset from the start of the stream in samples (at the model sample rate). Events are in order and alternate between starts and ends, beginning with a start.
+
+        Raises:
+            ValueError: If the data is not contiguous or of an unsupported sample type.
+            TypeError: If the data is not a buffer or a sequence of numbers.
+        """
+        if len(data) == 0:
+            return []
+        with self._vad._acquire_input(data) as (address, length):
+            max_events = 3 * ((length * self._vad.sample_rate // self._vad.input_sample_rate + 1) // self._window_size_samples + 1)
+            if len(self._events) < max_events:
+                self._events = (_SegmentEvent * max_events)()
+            num_events = self._lib.SpeechSegmenter_process(self._obj, address, length, self._events, len(self._events))
+        if num_events < 0:
+            raise RuntimeError("Failed to process data")
+        return self._get_events(num_events)
+
+    def process_scores(self, scores):
+        """
+        Process the VAD scores of the next windows of the stream, computed elsewhere (such as by `SileroVADBatch`, or saved from a previous run) instead of by running the model on audio, and return the segment events they produce. A segmenter should be given either scores or audio (with `process`), not both.
+
+        Args:
+            scores: The VAD scores, one per window, as a contiguous buffer of 32-bit floats or a sequence of numbers.
+
+        Returns:
+            list: The events, as for `process`.
+
+        Raises:
+            ValueError: If the scores are not contiguous or of an unsupported type.
+            TypeError: If the scores are not a buffer or a sequence of numbers.
+        """
+        if len(scores) == 0:
+            return []
+        with self._scores_buffer.acquire(scores, _FLOAT32_SIZE, _FLOAT32_TYPECODES) as (address, length):
+            if len(self._events) < 3 * length:
+                self._events = (_SegmentEvent * (3 * length))()
+            num_events = self._lib.SpeechSegmenter_process_scores(self._obj, address, length, self._events, len(self._events))
+        if num_events < 0:
+            raise RuntimeError("Failed to process scores")
+        return self._get_events(num_events)
+
+    def flush(self):
+        """
+        End the current segment (if any) at the end of the audio processed so far, such as at the end of the stream.
+
+        Returns:
+            list: The events, as for `process`: either empty, or a single `'end'` event.
+        """
+        num_events = self._lib.SpeechSegmenter_flush(self._obj, self._events, len(self._events))
+        if num_events < 0:
+            raise RuntimeError("Failed to flush segmenter")
+        return self._get_events(num_events)
+
+    def _get_events(self, num_events):
+        return [(_SEGMENT_EVENT_TYPES[event.type], event.sample) for event in self._events[:num_events]]
+
+def get_speech_timestamps(data, sample_rate, model_path=None, input_format='float32', input_sample_rate=None, session_options=None, **kwargs):
+    """
+    Find the speech segments in a complete buffer of audio, using a new SileroVAD object and SpeechSegmenter.
+
+    Args:
+        data: The input data to be processed. It supports the same types and audio formats as `SileroVAD.feed`, and can be of any length: any final partial window is ignored.
+        sample_rate (int): The sample rate for the model (8000 or 16000).
+        model_path (str, optional): The path to the model file. If not provided, the default model included in the package will be used.
+        input_format (str, optional): The format of the PCM samples, as for `SileroVAD`.
+        input_sample_rate (int, optional): The sample rate of the audio, if different from `sample_rate`, as for `SileroVAD`.
+        session_options (dict, optional): Options for the ONNX Runtime session, as for `SileroVAD`.
+        **kwargs: Any parameters for the SpeechSegmenter, such as `threshold` or `min_silence_duration_ms`.
+
+    Returns:
+        list: The speech segments, as dicts with `'start'` and `'end'` keys, in samples (at the model sample rate).
+    """
+    vad = SileroVAD(sample_rate, model_path=model_path, input_format=input_format, input_sample_rate=input_sample_rate, **(session_options or {}))
+    segmenter = SpeechSegmenter(vad, **kwargs)
+    events = segmenter.process(data)
+    events += segmenter.flush()
+    return [dict(start=start[1], end=end[1]) for start, end in zip(events[0::2], events[1::2])]
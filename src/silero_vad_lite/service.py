@@ -0,0 +1,315 @@
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import queue
+import threading
+
+from .silero_vad import SileroVAD
+
+class SileroVADService:
+
+    def __init__(self, sample_rate, num_workers=None, max_queue_size=64, **vad_kwargs):
+        """
+        Initializes the SileroVADService object, which processes many audio streams on a bounded set of worker threads.
+
+        Each stream has its own SileroVAD object, and is pinned to one worker thread (the one with the fewest streams when it was opened), so its data is always processed in order and its model state is never used from two threads at once. The model runs without holding the GIL, so the workers can use all cores. Each worker has a bounded queue of pending requests, so callers can be slowed down (or rejected) when a worker falls behind.
+
+        Args:
+            sample_rate (int): The sample rate of the audio, for all streams.
+            num_workers (int, optional): The number of worker threads. If not provided, the number of CPUs is used.
+            max_queue_size (int, optional): The maximum number of pending requests per worker.
+            **vad_kwargs: Any other arguments for the SileroVAD object of each stream, such as `input_format` or session options.
+
+        Returns:
+            SileroVADService: The SileroVADService object.
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if num_workers <= 0:
+            raise ValueError("Number of workers must be positive")
+        if max_queue_size <= 0:
+            raise ValueError("Maximum queue size must be positive")
+        self._sample_rate = sample_rate
+        self._max_queue_size = max_queue_size
+        self._vad_kwargs = vad_kwargs
+        self._lock = threading.Lock()
+        self._streams = {}  # Stream id -> (worker index, SileroVAD)
+        self._worker_num_streams = [0] * num_workers
+        self._next_stream_id = itertools.count()
+        self._shutdown = False
+        self._queues = [queue.Queue(maxsize=max_queue_size) for _ in range(num_workers)]
+        self._queue_locks = [threading.Lock() for _ in range(num_workers)]  # Held while putting to each queue, so no job can be put after the shutdown sentinel
+        self._threads = [threading.Thread(target=self._run_worker, args=(jobs,), name=f'SileroVADService-{i}', daemon=True) for i, jobs in enumerate(self._queues)]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    @property
+    def sample_rate(self):
+        """
+        Returns the sample rate of the audio.
+
+        Returns:
+            int: The sample rate of the audio.
+        """
+        return self._sample_rate
+
+    @property
+    def num_workers(self):
+        """
+        Returns the number of worker threads.
+
+        Returns:
+            int: The number of worker threads.
+        """
+        return len(self._threads)
+
+    @property
+    def max_queue_size(self):
+        """
+        Returns the maximum number of pending requests per worker.
+
+        Returns:
+            int: The maximum number of pending requests per worker.
+        """
+        return self._max_queue_size
+
+    def open_stream(self):
+        """
+        Opens a new stream, with a fresh SileroVAD object, pinned to the worker with the fewest streams.
+
+        Returns:
+            int: The id of the new stream.
+        """
+        vad = SileroVAD(self._sample_rate, **self._vad_kwargs)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Service has been shut down")
+            worker_index = min(range(len(self._worker_num_streams)), key=self._worker_num_streams.__getitem__)
+            self._worker_num_streams[worker_index] += 1
+            stream_id = next(self._next_stream_id)
+            self._streams[stream_id] = (worker_index, vad)
+        return stream_id
+
+    def close_stream(self, stream_id):
+        """
+        Closes a stream. Any requests already submitted for it are still completed.
+
+        Args:
+            stream_id (int): The id of the stream to close.
+
+        Raises:
+            ValueError: If the stream id is invalid.
+        """
+        with self._lock:
+            if stream_id not in self._streams:
+                raise ValueError(f"Invalid stream id: {stream_id}")
+            worker_index, _ = self._streams.pop(stream_id)
+            self._worker_num_streams[worker_index] -= 1
+
+    def submit(self, stream_id, data, method='process', block=True, timeout=None):
+        """
+        Submits data of a stream to be processed by its worker, after any requests already submitted for the stream.
+
+        Note: The data is not copied, so it must not be modified until the request has completed.
+
+        Args:
+            stream_id (int): The id of the stream.
+            data: The input data to be processed, as for the SileroVAD method.
+            method (str, optional): The SileroVAD method to process the data with: `'process'` (the default), `'process_many'`, or `'feed'`.
+            block (bool, optional): Whether to wait for room in the worker's queue if it is full. If False, `queue.Full` is raised instead.
+            timeout (float, optional): The maximum time to wait for room in the worker's queue, after which `queue.Full` is raised. If not provided, waits indefinitely.
+
+        Returns:
+            concurrent.futures.Future: A future for the result of the SileroVAD method.
+
+        Raises:
+            ValueError: If the stream id or method is invalid.
+            queue.Full: If the worker's queue is full, and `block` is False or the timeout expires.
+            RuntimeError: If the service has been shut down.
+        """
+        if method not in ('process', 'process_many', 'feed'):
+            raise ValueError(f"Invalid method: {method}")
+        with self._lock:
+            if stream_id not in self._streams:
+                raise ValueError(f"Invalid stream id: {stream_id}")
+            worker_index, vad = self._streams[stream_id]
+        future = concurrent.futures.Future()
+        with self._queue_locks[worker_index]:
+            # Checked under the queue lock, so the job is put either before the shutdown sentinel or not at all
+            if self._shutdown:
+                raise RuntimeError("Service has been shut down")
+            self._queues[worker_index].put((future, getattr(vad, method), data), block=block, timeout=timeout)
+        return future
+
+    def get_worker_index(self, stream_id):
+        """
+        Returns the index of the worker thread that a stream is pinned to.
+
+        Args:
+            stream_id (int): The id of the stream.
+
+        Returns:
+            int: The index of the worker, from 0 to `num_workers - 1`.
+
+        Raises:
+            ValueError: If the stream id is invalid.
+        """
+        with self._lock:
+            if stream_id not in self._streams:
+                raise ValueError(f"Invalid stream id: {stream_id}")
+            return self._streams[stream_id][0]
+
+    def shutdown(self, wait=True):
+        """
+        Shuts down the service, after completing all requests already submitted. No more requests can be submitted, and any `submit` call still waiting for room in a queue completes first.
+
+        Args:
+            wait (bool, optional): Whether to wait for the workers to finish.
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        for jobs, queue_lock in zip(self._queues, self._queue_locks):
+            with queue_lock:
+                jobs.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    @staticmethod
+    def _run_worker(jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            future, function, data = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = function(data)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+class AsyncSileroVADService:
+
+    def __init__(self, sample_rate, num_workers=None, max_queue_size=64, **vad_kwargs):
+        """
+        Initializes the AsyncSileroVADService object, which wraps a SileroVADService for use from asyncio code, without blocking the event loop.
+
+        When a worker's queue is full, submitting to it waits asynchronously for room, applying backpressure to the caller. Since waiting coroutines may resume in any order, the requests of each stream should be awaited one at a time (as they typically are for a live stream) to ensure they are processed in order. It should only be used from a single event loop.
+
+        Args:
+            sample_rate (int): The sample rate of the audio, for all streams.
+            num_workers (int, optional): The number of worker threads. If not provided, the number of CPUs is used.
+            max_queue_size (int, optional): The maximum number of pending requests per worker.
+            **vad_kwargs: Any other arguments for the SileroVAD object of each stream, such as `input_format` or session options.
+
+        Returns:
+            AsyncSileroVADService: The AsyncSileroVADService object.
+        """
+        self._service = SileroVADService(sample_rate, num_workers=num_workers, max_queue_size=max_queue_size, **vad_kwargs)
+        self._semaphores = None  # Per worker, created on first use, to be bound to the running event loop
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.shutdown()
+
+    @property
+    def service(self):
+        """
+        Returns the underlying SileroVADService.
+
+        Returns:
+            SileroVADService: The underlying service.
+        """
+        return self._service
+
+    async def open_stream(self):
+        """
+        Opens a new stream, as for `SileroVADService.open_stream`, creating its SileroVAD object (which loads the model) in the default executor, without blocking the event loop.
+
+        Returns:
+            int: The id of the new stream.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._service.open_stream)
+
+    def close_stream(self, stream_id):
+        """
+        Closes a stream, as for `SileroVADService.close_stream`.
+
+        Args:
+            stream_id (int): The id of the stream to close.
+        """
+        self._service.close_stream(stream_id)
+
+    async def process(self, stream_id, data):
+        """
+        Processes one window of data of a stream, as for `SileroVAD.process`.
+
+        Returns:
+            float: The VAD score.
+        """
+        return await self.submit(stream_id, data, method='process')
+
+    async def process_many(self, stream_id, data):
+        """
+        Processes consecutive windows of data of a stream, as for `SileroVAD.process_many`.
+
+        Returns:
+            array.array: The VAD scores.
+        """
+        return await self.submit(stream_id, data, method='process_many')
+
+    async def feed(self, stream_id, data):
+        """
+        Feeds data of any length of a stream, as for `SileroVAD.feed`.
+
+        Returns:
+            list: The `(offset, score)` results.
+        """
+        return await self.submit(stream_id, data, method='feed')
+
+    async def submit(self, stream_id, data, method='process'):
+        """
+        Submits data of a stream to be processed by its worker, waiting asynchronously for room in the worker's queue if it is full, and returns the result.
+
+        Note: The data is not copied, so it must not be modified until the request has completed.
+
+        Args:
+            stream_id (int): The id of the stream.
+            data: The input data to be processed, as for the SileroVAD method.
+            method (str, optional): The SileroVAD method to process the data with: `'process'` (the default), `'process_many'`, or `'feed'`.
+
+        Returns:
+            The result of the SileroVAD method.
+        """
+        if self._semaphores is None:
+            self._semaphores = [asyncio.Semaphore(self._service.max_queue_size) for _ in range(self._service.num_workers)]
+        semaphore = self._semaphores[self._service.get_worker_index(stream_id)]
+        await semaphore.acquire()
+        try:
+            future = self._service.submit(stream_id, data, method=method, block=False)
+        except BaseException:
+            semaphore.release()
+            raise
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+        return await asyncio.wrap_future(future)
+
+    async def shutdown(self):
+        """
+        Shuts down the service, after completing all requests already submitted, without blocking the event loop.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._service.shutdown)
@@ -1,9 +1,25 @@
+#include <algorithm>
+#include <chrono>
+#include <cmath>
 #include <codecvt>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
 #include <iostream>
 #include <locale>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <random>
 #include <string>
 #include <vector>
 
+#ifdef _WIN32
+#define NOMINMAX
+#define WIN32_LEAN_AND_MEAN
+#include <windows.h>
+#endif
+
 #include <onnxruntime_cxx_api.h>
 
 // Helper function to convert std::string (in UTF-8) to std::wstring, which is required for Windows
@@ -12,11 +28,311 @@ std::wstring string_to_wstring(const std::string& str) {
     return converter.from_bytes(str);
 }
 
+// Helper function to convert a path (in UTF-8) to the string type used for paths by ONNX Runtime
+#ifdef _WIN32
+std::wstring to_ort_path(const std::string& path) {
+    return string_to_wstring(path);
+}
+#else
+std::string to_ort_path(const std::string& path) {
+    return path;
+}
+#endif
+
+// Helper function to replace a file atomically with another one in the same directory, returning whether it succeeded
+bool replace_file(const std::string& from_path, const std::string& to_path) {
+#ifdef _WIN32
+    return MoveFileExW(string_to_wstring(from_path).c_str(), string_to_wstring(to_path).c_str(), MOVEFILE_REPLACE_EXISTING) != 0;
+#else
+    return std::rename(from_path.c_str(), to_path.c_str()) == 0;
+#endif
+}
+
+// Helper function to get a path for a temporary file next to the given path, unique across threads and processes
+std::string unique_temp_path(const std::string& path) {
+    static std::mutex mutex;
+    static std::mt19937_64 generator(std::random_device{}() ^ static_cast<uint64_t>(std::chrono::steady_clock::now().time_since_epoch().count()));
+    std::lock_guard<std::mutex> lock(mutex);
+    return path + ".tmp" + std::to_string(generator());
+}
+
+// Options for creating an ONNX Runtime session, which together with the model path identify a shared session.
+// This is a plain struct, so it can also be passed through the C API.
+struct SessionConfig {
+    int intra_op_num_threads = 1;
+    int inter_op_num_threads = 1;
+    int execution_mode = ORT_SEQUENTIAL;
+    int graph_optimization_level = ORT_ENABLE_ALL;
+    int enable_cpu_mem_arena = 1;
+    int enable_mem_pattern = 1;
+    const char* optimized_model_path = nullptr;  // If set, the optimized model is loaded from this path if it exists and loads, otherwise it is saved there
+    const char* profile_file_prefix = nullptr;  // If set, ONNX Runtime profiling is enabled, writing a trace file with this prefix
+
+    std::string key(const std::string& model_path) const {
+        return model_path
+            + "|" + std::to_string(intra_op_num_threads)
+            + "|" + std::to_string(inter_op_num_threads)
+            + "|" + std::to_string(execution_mode)
+            + "|" + std::to_string(graph_optimization_level)
+            + "|" + std::to_string(enable_cpu_mem_arena)
+            + "|" + std::to_string(enable_mem_pattern)
+            + "|" + (optimized_model_path ? optimized_model_path : "")
+            + "|" + (profile_file_prefix ? profile_file_prefix : "");
+    }
+};
+
+// An ONNX Runtime session for a model, shared by all SileroVAD and SileroVADBatch instances using the same model and config.
+// Session::Run is thread-safe, so instances in different threads can use the same session concurrently.
+struct SharedSession {
+    std::shared_ptr<Ort::Env> env;  // Held to ensure the environment outlives the session
+    Ort::SessionOptions session_options;
+    std::unique_ptr<Ort::Session> session;
+
+    SharedSession(std::shared_ptr<Ort::Env> env, const std::string& model_path, const SessionConfig& config) :
+        env(env)
+    {
+        session_options.SetIntraOpNumThreads(config.intra_op_num_threads);
+        session_options.SetInterOpNumThreads(config.inter_op_num_threads);
+        session_options.SetExecutionMode(static_cast<ExecutionMode>(config.execution_mode));
+        if (config.enable_cpu_mem_arena) {
+            session_options.EnableCpuMemArena();
+        } else {
+            session_options.DisableCpuMemArena();
+        }
+        if (config.enable_mem_pattern) {
+            session_options.EnableMemPattern();
+        } else {
+            session_options.DisableMemPattern();
+        }
+        if (config.profile_file_prefix) {
+            session_options.EnableProfiling(to_ort_path(config.profile_file_prefix).c_str());
+        }
+
+        if (config.optimized_model_path && std::ifstream(config.optimized_model_path).good()) {
+            // The cached model has already been optimized, so skip optimizing it again
+            session_options.SetGraphOptimizationLevel(ORT_DISABLE_ALL);
+            try {
+                session = std::unique_ptr<Ort::Session>(new Ort::Session(*env, to_ort_path(config.optimized_model_path).c_str(), session_options));
+                return;
+            } catch (const std::exception& e) {
+                std::cerr << "Failed to load cached optimized model " << config.optimized_model_path << ", so regenerating it: " << e.what() << std::endl;
+            }
+        }
+
+        session_options.SetGraphOptimizationLevel(static_cast<GraphOptimizationLevel>(config.graph_optimization_level));
+        if (!config.optimized_model_path) {
+            session = std::unique_ptr<Ort::Session>(new Ort::Session(*env, to_ort_path(model_path).c_str(), session_options));
+            return;
+        }
+        // ONNX Runtime writes the optimized model while creating the session, so write it to a temporary file and then rename it into place,
+        // so that other processes starting concurrently never load a partially written file
+        const std::string temp_path = unique_temp_path(config.optimized_model_path);
+        const auto temp_path_ort = to_ort_path(temp_path);
+        session_options.SetOptimizedModelFilePath(temp_path_ort.c_str());
+        try {
+            session = std::unique_ptr<Ort::Session>(new Ort::Session(*env, to_ort_path(model_path).c_str(), session_options));
+        } catch (...) {
+            std::remove(temp_path.c_str());
+            throw;
+        }
+        if (!replace_file(temp_path, config.optimized_model_path)) {
+            std::cerr << "Failed to save optimized model to " << config.optimized_model_path << std::endl;
+            std::remove(temp_path.c_str());
+        }
+    }
+
+    // Get the session for the given model and config, creating it (and the environment) only if no live instance is already using one
+    static std::shared_ptr<SharedSession> get(const std::string& model_path, const SessionConfig& config) {
+        static std::mutex mutex;
+        static std::weak_ptr<Ort::Env> cached_env;
+        static std::map<std::string, std::weak_ptr<SharedSession>> cached_sessions;
+
+        std::lock_guard<std::mutex> lock(mutex);
+        const std::string key = config.key(model_path);
+        auto shared_session = cached_sessions[key].lock();
+        if (!shared_session) {
+            auto env = cached_env.lock();
+            if (!env) {
+                env = std::make_shared<Ort::Env>(ORT_LOGGING_LEVEL_WARNING, "SileroVAD");
+                cached_env = env;
+            }
+            shared_session = std::make_shared<SharedSession>(env, model_path, config);
+            cached_sessions[key] = shared_session;
+        }
+        return shared_session;
+    }
+
+    // Stop profiling, returning the path of the trace file written, or an empty string if profiling was not enabled
+    std::string end_profiling() {
+        Ort::AllocatorWithDefaultOptions allocator;
+        return std::string(session->EndProfilingAllocated(allocator).get());
+    }
+};
+
+// Counters of the model runs of a SileroVAD instance, recorded around each session->Run
+struct InferenceStats {
+    static const int NUM_HISTOGRAM_BUCKETS = 32;
+
+    int64_t num_windows = 0;  // Number of windows run through the model
+    int64_t num_gated_windows = 0;  // Number of windows skipped by the energy gate, which are not included in the other counters
+    int64_t total_ns = 0;  // Total inference time
+    int64_t last_ns = 0;  // Inference time of the last window
+    int64_t min_ns = 0;  // Zero until the first window
+    int64_t max_ns = 0;
+    int64_t histogram[NUM_HISTOGRAM_BUCKETS] = {};  // Bucket 0 counts times under 1 us, bucket i times in [2^(i-1), 2^i) us, and the last bucket all longer times
+
+    void record(int64_t ns) {
+        num_windows++;
+        total_ns += ns;
+        last_ns = ns;
+        min_ns = (num_windows == 1) ? ns : std::min(min_ns, ns);
+        max_ns = std::max(max_ns, ns);
+        int bucket = 0;
+        for (int64_t us = ns / 1000; us > 0 && bucket < NUM_HISTOGRAM_BUCKETS - 1; us >>= 1) {
+            bucket++;
+        }
+        histogram[bucket]++;
+    }
+};
+
+// Measures of the energy of a window, for the energy gate
+enum EnergyGateMode {
+    ENERGY_GATE_OFF = 0,
+    ENERGY_GATE_RMS = 1,
+    ENERGY_GATE_PEAK = 2,
+};
+
+// Formats of input PCM samples, in native byte order, which are converted to normalized 32-bit floats for the model
+enum SampleFormat {
+    SAMPLE_FORMAT_FLOAT32 = 0,
+    SAMPLE_FORMAT_INT16 = 1,
+    SAMPLE_FORMAT_INT32 = 2,
+    SAMPLE_FORMAT_UINT8 = 3,
+    SAMPLE_FORMAT_FLOAT64 = 4,
+};
+
+// Convert num_samples samples of the given format to normalized floats in out
+void convert_samples(const void* data, size_t num_samples, int format, float* out) {
+    switch (format) {
+        case SAMPLE_FORMAT_FLOAT32:
+            std::memcpy(out, data, num_samples * sizeof(float));
+            break;
+        case SAMPLE_FORMAT_INT16: {
+            const int16_t* samples = static_cast<const int16_t*>(data);
+            for (size_t i = 0; i < num_samples; i++) {
+                out[i] = samples[i] * (1.0f / 32768.0f);
+            }
+            break;
+        }
+        case SAMPLE_FORMAT_INT32: {
+            const int32_t* samples = static_cast<const int32_t*>(data);
+            for (size_t i = 0; i < num_samples; i++) {
+                out[i] = static_cast<float>(samples[i] * (1.0 / 2147483648.0));
+            }
+            break;
+        }
+        case SAMPLE_FORMAT_UINT8: {
+            const uint8_t* samples = static_cast<const uint8_t*>(data);
+            for (size_t i = 0; i < num_samples; i++) {
+                out[i] = (static_cast<int>(samples[i]) - 128) * (1.0f / 128.0f);
+            }
+            break;
+        }
+        case SAMPLE_FORMAT_FLOAT64: {
+            const double* samples = static_cast<const double*>(data);
+            for (size_t i = 0; i < num_samples; i++) {
+                out[i] = static_cast<float>(samples[i]);
+            }
+            break;
+        }
+        default:
+            throw std::invalid_argument("Invalid sample format");
+    }
+}
+
+// Streaming polyphase windowed-sinc resampler, keeping the input history needed between calls, so a stream can be resampled in chunks of any size
+class StreamingResampler {
+private:
+    static const int zero_crossings = 16;  // Per side of the kernel, at the cutoff frequency
+    static const int64_t max_phases = 4096;
+
+    int64_t up;  // Output samples per `down` input samples, reduced
+    int64_t down;
+    int half_taps;  // Kernel taps per side of each output sample
+    std::vector<float> kernel;  // For each phase, the 2 * half_taps weights of the input samples from (position - half_taps + 1) to (position + half_taps)
+
+    std::vector<float> history;  // Input samples from (position - half_taps + 1) onwards
+    int64_t phase = 0;  // Fractional part of the input position of the next output sample, in units of 1 / up
+
+    static int64_t gcd(int64_t a, int64_t b) {
+        return b == 0 ? a : gcd(b, a % b);
+    }
+
+public:
+    StreamingResampler(int input_sample_rate, int output_sample_rate) {
+        if (input_sample_rate <= 0 || output_sample_rate <= 0) {
+            throw std::invalid_argument("Sample rates must be positive");
+        }
+        const int64_t divisor = gcd(input_sample_rate, output_sample_rate);
+        up = output_sample_rate / divisor;
+        down = input_sample_rate / divisor;
+        if (up > max_phases) {
+            throw std::invalid_argument("Unsupported ratio of sample rates");
+        }
+
+        // Lowpass at the lower of the two Nyquist frequencies, slightly reduced to attenuate aliasing within the transition band
+        const double cutoff = 0.95 * std::min(1.0, static_cast<double>(up) / down);
+        half_taps = static_cast<int>(std::ceil(zero_crossings / cutoff));
+        kernel.resize(up * 2 * half_taps);
+        const double pi = 3.14159265358979323846;
+        for (int64_t p = 0; p < up; p++) {
+            float* weights = &kernel[p * 2 * half_taps];
+            double sum = 0.0;
+            for (int j = 0; j < 2 * half_taps; j++) {
+                const double x = (static_cast<double>(p) / up) - (j - half_taps + 1);  // Distance from the output sample to the input sample
+                const double u = x / half_taps;
+                const double window = std::fabs(u) >= 1.0 ? 0.0 : 0.42 + 0.5 * std::cos(pi * u) + 0.08 * std::cos(2 * pi * u);  // Blackman
+                const double sinc = x == 0.0 ? 1.0 : std::sin(pi * cutoff * x) / (pi * cutoff * x);
+                weights[j] = static_cast<float>(cutoff * sinc * window);
+                sum += weights[j];
+            }
+            for (int j = 0; j < 2 * half_taps; j++) {
+                weights[j] = static_cast<float>(weights[j] / sum);  // Unity gain at DC
+            }
+        }
+        reset();
+    }
+
+    void reset() {
+        history.assign(half_taps - 1, 0.0f);  // The stream is preceded by silence
+        phase = 0;
+    }
+
+    // Resample the next size input samples of the stream, appending the resulting output samples to out
+    void process(const float* data, size_t size, std::vector<float>& out) {
+        history.insert(history.end(), data, data + size);
+        const size_t taps = 2 * half_taps;
+        size_t start = 0;  // Index in history of the first input sample for the next output sample
+        while (start + taps <= history.size()) {
+            const float* samples = &history[start];
+            const float* weights = &kernel[phase * taps];
+            float sum = 0.0f;
+            for (size_t j = 0; j < taps; j++) {
+                sum += samples[j] * weights[j];
+            }
+            out.push_back(sum);
+            phase += down;
+            start += phase / up;
+            phase %= up;
+        }
+        history.erase(history.begin(), history.begin() + std::min(start, history.size()));
+    }
+};
+
 class SileroVAD {
 private:
-    Ort::Env env;
-    Ort::SessionOptions session_options;
-    std::shared_ptr<Ort::Session> session = nullptr;
+    std::shared_ptr<SharedSession> shared_session;
+    Ort::Session* session;
     Ort::MemoryInfo memory_info;
 
     std::vector<Ort::Value> ort_inputs;
@@ -32,19 +348,45 @@ private:
     std::vector<Ort::Value> ort_outputs;
     std::vector<const char *> output_node_names = {"output", "stateN"};
 
-    void init_engine_threads(int inter_threads, int intra_threads)
-    {
-        // The method should be called in each thread/proc in multi-thread/proc work
-        session_options.SetIntraOpNumThreads(intra_threads);
-        session_options.SetInterOpNumThreads(inter_threads);
-        session_options.SetGraphOptimizationLevel(GraphOptimizationLevel::ORT_ENABLE_ALL);
-    };
+    std::vector<float> pending_samples;  // Samples fed but not yet processed, always fewer than window_size_samples
+    int64_t processed_samples = 0;  // Number of samples run through the model so far
+
+    int input_format = SAMPLE_FORMAT_FLOAT32;
+    std::unique_ptr<StreamingResampler> resampler;  // Only if the input sample rate differs from the model sample rate
+    std::vector<float> converted_samples;
+    std::vector<float> resampled_samples;
+
+    bool stats_enabled = false;
+    InferenceStats stats;
+
+    int gate_mode = ENERGY_GATE_OFF;
+    float gate_floor = 0.0f;  // Windows with energy below this (as a normalized amplitude) are not run through the model
+    float gate_probability = 0.0f;  // Speech probability returned for gated windows
+    bool gate_reset_state = false;  // Whether gated windows reset the model state to zeros, rather than leaving it unchanged
+
+    // Whether the window is quiet enough to skip running the model on it
+    bool is_gated(const float* data, size_t size) const {
+        if (gate_mode == ENERGY_GATE_RMS) {
+            float sum_squares = 0.0f;
+            for (size_t i = 0; i < size; i++) {
+                sum_squares += data[i] * data[i];
+            }
+            return std::sqrt(sum_squares / size) < gate_floor;
+        } else if (gate_mode == ENERGY_GATE_PEAK) {
+            for (size_t i = 0; i < size; i++) {
+                if (std::fabs(data[i]) >= gate_floor) {
+                    return false;
+                }
+            }
+            return true;
+        }
+        return false;
+    }
 
 public:
     const size_t window_size_samples;
 
-    SileroVAD(const std::string& model_path, int sample_rate) :
-        env(ORT_LOGGING_LEVEL_WARNING, "SileroVAD"),
+    SileroVAD(const std::string& model_path, int sample_rate, const SessionConfig& config) :
         memory_info(Ort::MemoryInfo::CreateCpu(OrtArenaAllocator, OrtMemTypeCPU)),
         ort_state(2 * 1 * 128),
         ort_sample_rate(1, sample_rate),
@@ -54,23 +396,27 @@ public:
             throw std::invalid_argument("Sample rate must be 16000 or 8000");
         }
 
-        init_engine_threads(1, 1);
-        #ifdef _WIN32
-            const auto model_path_wstr = string_to_wstring(model_path);
-            const ORTCHAR_T* model_path_ort = model_path_wstr.c_str();
-        #else
-            const ORTCHAR_T* model_path_ort = model_path.c_str();
-        #endif
-        session = std::make_shared<Ort::Session>(env, model_path_ort, session_options);
+        shared_session = SharedSession::get(model_path, config);
+        session = shared_session->session.get();
         ort_input_node_shape[1] = window_size_samples;
+        pending_samples.reserve(window_size_samples);
     }
 
     // Run model to compute speech probability of exactly one window
-    float predict(float* data, size_t size) {
+    float predict(const float* data, size_t size) {
         if (size != window_size_samples) {
             throw std::invalid_argument("Input size must be equal to window_size_samples");
         }
-        Ort::Value input_ort = Ort::Value::CreateTensor<float>(memory_info, data, size, ort_input_node_shape, 2);
+        if (gate_mode != ENERGY_GATE_OFF && is_gated(data, size)) {
+            if (gate_reset_state) {
+                std::fill(ort_state.begin(), ort_state.end(), 0.0f);
+            }
+            stats.num_gated_windows++;  // Counted even while stats are disabled, as it needs no timing
+            processed_samples += size;
+            return gate_probability;
+        }
+        // The model does not modify its input, so it can be run directly on read-only data
+        Ort::Value input_ort = Ort::Value::CreateTensor<float>(memory_info, const_cast<float*>(data), size, ort_input_node_shape, 2);
         Ort::Value state_ort = Ort::Value::CreateTensor<float>(memory_info, ort_state.data(), ort_state.size(), ort_state_node_shape, 3);
         Ort::Value sr_ort = Ort::Value::CreateTensor<int64_t>(memory_info, ort_sample_rate.data(), ort_sample_rate.size(), ort_sample_rate_node_shape, 1);
 
@@ -79,17 +425,587 @@ public:
         ort_inputs.emplace_back(std::move(state_ort));
         ort_inputs.emplace_back(std::move(sr_ort));
 
+        const auto run_start = stats_enabled ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
         ort_outputs = session->Run(
             Ort::RunOptions{nullptr},
             ort_input_node_names.data(), ort_inputs.data(), ort_inputs.size(),
             output_node_names.data(), output_node_names.size());
+        if (stats_enabled) {
+            stats.record(std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - run_start).count());
+        }
 
         float speech_prob = ort_outputs[0].GetTensorMutableData<float>()[0];
         float *stateN_output = ort_outputs[1].GetTensorMutableData<float>();
         std::memcpy(ort_state.data(), stateN_output, ort_state.size() * sizeof(float));
+        processed_samples += size;
 
         return speech_prob;
     }
+
+    // Run model over consecutive windows of data, writing the speech probability of each window to out
+    size_t predict_many(const float* data, size_t size, float* out, size_t out_size) {
+        if (size % window_size_samples != 0) {
+            throw std::invalid_argument("Input size must be a multiple of window_size_samples");
+        }
+        const size_t num_windows = size / window_size_samples;
+        if (out_size < num_windows) {
+            throw std::invalid_argument("Output size must be at least the number of windows");
+        }
+        for (size_t i = 0; i < num_windows; i++) {
+            out[i] = predict(data + i * window_size_samples, window_size_samples);
+        }
+        return num_windows;
+    }
+
+    // Buffer data of any size, running the model on each window as soon as it is complete, and calling on_window(window_start, speech_prob) for each.
+    // Complete windows are processed directly from data, and only samples of a partial window are copied.
+    template <typename Callback>
+    size_t feed(const float* data, size_t size, Callback on_window) {
+        size_t num_windows = 0;
+        size_t offset = 0;
+        if (!pending_samples.empty()) {
+            offset = std::min(window_size_samples - pending_samples.size(), size);
+            pending_samples.insert(pending_samples.end(), data, data + offset);
+            if (pending_samples.size() < window_size_samples) {
+                return 0;
+            }
+            const int64_t window_start = processed_samples;
+            on_window(window_start, predict(pending_samples.data(), window_size_samples));
+            pending_samples.clear();
+            num_windows++;
+        }
+        for (; size - offset >= window_size_samples; offset += window_size_samples) {
+            const int64_t window_start = processed_samples;
+            on_window(window_start, predict(data + offset, window_size_samples));
+            num_windows++;
+        }
+        pending_samples.insert(pending_samples.end(), data + offset, data + size);
+        return num_windows;
+    }
+
+    // Feed input data of any size, writing the speech probability and start offset of each window completed to out and out_offsets
+    size_t feed_input(const void* data, size_t num_samples, float* out, int64_t* out_offsets, size_t out_size) {
+        return feed_input(data, num_samples, out_size, [&](int64_t window_start, float speech_prob) {
+            *out++ = speech_prob;
+            *out_offsets++ = window_start;
+        });
+    }
+
+    // Set the format and sample rate of input data passed to feed_input
+    void set_input(int format, int input_sample_rate) {
+        if (format < SAMPLE_FORMAT_FLOAT32 || format > SAMPLE_FORMAT_FLOAT64) {
+            throw std::invalid_argument("Invalid sample format");
+        }
+        input_format = format;
+        if (input_sample_rate == ort_sample_rate[0]) {
+            resampler.reset();
+        } else {
+            resampler.reset(new StreamingResampler(input_sample_rate, static_cast<int>(ort_sample_rate[0])));
+        }
+    }
+
+    // Get complete windows of input data in the input format (at the model sample rate) as 32-bit floats, converting them into a scratch buffer unless they are float32 already
+    const float* get_window_input(const void* data, size_t num_samples) {
+        if (resampler) {
+            throw std::invalid_argument("Input at another sample rate can only be passed to feed");
+        }
+        if (input_format == SAMPLE_FORMAT_FLOAT32) {
+            return static_cast<const float*>(data);
+        }
+        converted_samples.resize(num_samples);
+        convert_samples(data, num_samples, input_format, converted_samples.data());
+        return converted_samples.data();
+    }
+
+    // Feed input data of any size, in the input format and sample rate, converting and resampling it to the model sample rate as needed
+    template <typename Callback>
+    size_t feed_input(const void* data, size_t num_samples, size_t max_windows, Callback on_window) {
+        const float* samples;
+        size_t size;
+        if (input_format == SAMPLE_FORMAT_FLOAT32 && !resampler) {
+            samples = static_cast<const float*>(data);
+            size = num_samples;
+        } else {
+            converted_samples.resize(num_samples);
+            convert_samples(data, num_samples, input_format, converted_samples.data());
+            samples = converted_samples.data();
+            size = num_samples;
+            if (resampler) {
+                resampled_samples.clear();
+                resampler->process(converted_samples.data(), num_samples, resampled_samples);
+                samples = resampled_samples.data();
+                size = resampled_samples.size();
+            }
+        }
+        if ((pending_samples.size() + size) / window_size_samples > max_windows) {
+            throw std::invalid_argument("Output size must be at least the number of windows completed");
+        }
+        return feed(samples, size, on_window);
+    }
+
+    size_t get_pending_samples() const {
+        return pending_samples.size();
+    }
+
+    // Reset to the start of a new stream, clearing the model state, buffered samples, resampler history, and sample offset
+    void reset() {
+        std::fill(ort_state.begin(), ort_state.end(), 0.0f);
+        pending_samples.clear();
+        processed_samples = 0;
+        if (resampler) {
+            resampler->reset();
+        }
+    }
+
+    size_t get_state_size() const {
+        return ort_state.size();
+    }
+
+    void get_state(float* out, size_t size) const {
+        if (size != ort_state.size()) {
+            throw std::invalid_argument("State size must be equal to the model state size");
+        }
+        std::copy(ort_state.begin(), ort_state.end(), out);
+    }
+
+    void set_state(const float* data, size_t size) {
+        if (size != ort_state.size()) {
+            throw std::invalid_argument("State size must be equal to the model state size");
+        }
+        std::copy(data, data + size, ort_state.begin());
+    }
+
+    // Configure the energy gate, which skips running the model on windows whose RMS or peak amplitude is below floor, returning probability for them instead
+    void set_energy_gate(int mode, float floor, float probability, bool reset_state) {
+        if (mode < ENERGY_GATE_OFF || mode > ENERGY_GATE_PEAK) {
+            throw std::invalid_argument("Invalid energy gate mode");
+        }
+        gate_mode = mode;
+        gate_floor = floor;
+        gate_probability = probability;
+        gate_reset_state = reset_state;
+    }
+
+    // Enable or disable recording inference stats; they are kept across reset(), as they describe the instance rather than the stream
+    void set_stats_enabled(bool enabled) {
+        stats_enabled = enabled;
+    }
+
+    const InferenceStats& get_stats() const {
+        return stats;
+    }
+
+    void reset_stats() {
+        stats = InferenceStats();
+    }
+
+    std::string end_profiling() {
+        return shared_session->end_profiling();
+    }
+};
+
+// An event emitted by SpeechSegmenter, at a sample offset from the start of the stream (at the model sample rate)
+struct SegmentEvent {
+    int64_t sample;
+    int32_t type;  // One of SegmentEvent::END or SegmentEvent::START
+
+    static const int32_t END = 0;
+    static const int32_t START = 1;
+};
+
+// Parameters for turning speech probabilities into speech segments, with durations in samples (at the model sample rate)
+struct SegmenterConfig {
+    float threshold;  // Probability at or above which a window is speech
+    float neg_threshold;  // Probability below which a window is silence; windows in between continue the current state
+    int64_t min_speech_samples;  // Speech must last this long before a segment is started
+    int64_t min_silence_samples;  // Silence must last this long before a segment is ended
+    int64_t speech_pad_samples;  // Segments are extended by this much on both sides
+    int64_t max_speech_samples;  // Segments longer than this are split; zero for unlimited
+};
+
+// Incrementally segments a stream of audio into speech segments, running the given SileroVAD on each window and applying hysteresis to the speech probabilities
+class SpeechSegmenter {
+private:
+    SileroVAD* vad;  // Not owned
+    const SegmenterConfig config;
+
+    int64_t current_sample = 0;  // End of the last window processed
+    bool triggered = false;  // Whether we are inside a segment (whose start has been emitted)
+    int64_t candidate_start = -1;  // Start of possible speech not yet long enough to start a segment, or -1
+    int64_t segment_start = -1;  // Start of the current segment (including padding), or -1
+    int64_t silence_start = -1;  // Start of possible silence within the current segment, or -1
+    int64_t last_end = 0;  // End of the last segment (including padding), which the next segment may not overlap
+
+    std::vector<SegmentEvent> pending_events;
+
+    void emit(int32_t type, int64_t sample) {
+        pending_events.push_back(SegmentEvent{sample, type});
+    }
+
+    void start_segment(int64_t sample) {
+        segment_start = std::max(sample - config.speech_pad_samples, last_end);
+        emit(SegmentEvent::START, segment_start);
+        triggered = true;
+        candidate_start = -1;
+        silence_start = -1;
+    }
+
+    void end_segment(int64_t sample) {
+        if (config.max_speech_samples > 0) {
+            sample = std::min(sample, segment_start + config.max_speech_samples);
+        }
+        last_end = sample;
+        emit(SegmentEvent::END, sample);
+        triggered = false;
+        segment_start = -1;
+        silence_start = -1;
+    }
+
+    // Update the state for one window of audio starting at window_start, with the given speech probability
+    void update(int64_t window_start, float speech_prob) {
+        const int64_t window_end = window_start + static_cast<int64_t>(vad->window_size_samples);
+        if (!triggered) {
+            if (speech_prob >= config.threshold) {
+                if (candidate_start < 0) {
+                    candidate_start = window_start;
+                }
+                if (window_end - candidate_start >= config.min_speech_samples) {
+                    start_segment(candidate_start);
+                }
+            } else if (speech_prob < config.neg_threshold) {
+                candidate_start = -1;
+            }
+        } else {
+            if (speech_prob >= config.threshold) {
+                silence_start = -1;
+            } else if (speech_prob < config.neg_threshold) {
+                if (silence_start < 0) {
+                    silence_start = window_start;
+                }
+                if (window_end - silence_start >= config.min_silence_samples) {
+                    end_segment(silence_start + config.speech_pad_samples);
+                    return;
+                }
+            }
+        }
+        // Split the segment (including one started by this window) before the next window would take it over the maximum duration
+        if (triggered && config.max_speech_samples > 0 && window_end + static_cast<int64_t>(vad->window_size_samples) - segment_start > config.max_speech_samples) {
+            end_segment(window_end);
+            if (speech_prob >= config.threshold) {
+                start_segment(last_end);
+            }
+        }
+    }
+
+public:
+    SpeechSegmenter(SileroVAD* vad, const SegmenterConfig& config) :
+        vad(vad),
+        config(config)
+    {
+        if (config.neg_threshold > config.threshold) {
+            throw std::invalid_argument("neg_threshold must not be greater than threshold");
+        }
+    }
+
+    // Feed input data of any size to the SileroVAD, and move any resulting events (at most three per window completed) into events, returning the number of events
+    size_t process(const void* data, size_t num_samples, SegmentEvent* events, size_t max_events) {
+        pending_events.clear();
+        vad->feed_input(data, num_samples, max_events / 3, [&](int64_t window_start, float speech_prob) {
+            update(window_start, speech_prob);
+            current_sample = window_start + static_cast<int64_t>(vad->window_size_samples);
+        });
+        std::copy(pending_events.begin(), pending_events.end(), events);
+        return pending_events.size();
+    }
+
+    // Update the state with the speech probabilities of the next windows, computed elsewhere, instead of feeding audio, and move any resulting events (at most three per window) into events, returning the number of events
+    size_t process_scores(const float* scores, size_t num_scores, SegmentEvent* events, size_t max_events) {
+        if (num_scores > max_events / 3) {
+            throw std::invalid_argument("Events buffer is too small");
+        }
+        pending_events.clear();
+        for (size_t i = 0; i < num_scores; i++) {
+            update(current_sample, scores[i]);
+            current_sample += static_cast<int64_t>(vad->window_size_samples);
+        }
+        std::copy(pending_events.begin(), pending_events.end(), events);
+        return pending_events.size();
+    }
+
+    // End the current segment (if any) at the end of the audio processed so far, and move the resulting event (if any) into events, returning the number of events
+    size_t flush(SegmentEvent* events, size_t max_events) {
+        if (max_events < 1) {
+            throw std::invalid_argument("Events buffer must have room for at least one event");
+        }
+        pending_events.clear();
+        if (triggered) {
+            end_segment(silence_start >= 0 ? std::min(silence_start + config.speech_pad_samples, current_sample) : current_sample);
+        }
+        candidate_start = -1;
+        std::copy(pending_events.begin(), pending_events.end(), events);
+        return pending_events.size();
+    }
+};
+
+// Runs one window from each of many independent streams through the model in a single batched call
+class SileroVADBatch {
+private:
+    std::shared_ptr<SharedSession> shared_session;
+    Ort::Session* session;
+    Ort::MemoryInfo memory_info;
+
+    std::vector<Ort::Value> ort_inputs;
+
+    std::vector<const char *> ort_input_node_names = {"input", "state", "sr"};
+    std::vector<float> ort_batch_input;
+    std::vector<float> ort_batch_state;
+    std::vector<int64_t> ort_sample_rate;
+
+    int64_t ort_input_node_shape[2] = {0, 0};  // Set to {batch_size, window_size_samples} for each run
+    int64_t ort_state_node_shape[3] = {2, 0, 128};  // Element 1 will be set to batch_size for each run
+    const int64_t ort_sample_rate_node_shape[1] = {1};
+
+    std::vector<Ort::Value> ort_outputs;
+    std::vector<const char *> output_node_names = {"output", "stateN"};
+
+    const size_t state_size = 2 * 128;
+    std::vector<std::vector<float>> stream_states;  // Per stream, indexed by stream id, laid out as {2, 128}
+    std::vector<bool> stream_active;
+    size_t num_active_streams = 0;
+
+    void check_stream(int64_t stream_id) const {
+        if (stream_id < 0 || static_cast<size_t>(stream_id) >= stream_active.size() || !stream_active[stream_id]) {
+            throw std::invalid_argument("Invalid stream id");
+        }
+    }
+
+public:
+    const size_t window_size_samples;
+
+    SileroVADBatch(const std::string& model_path, int sample_rate, const SessionConfig& config) :
+        memory_info(Ort::MemoryInfo::CreateCpu(OrtArenaAllocator, OrtMemTypeCPU)),
+        ort_sample_rate(1, sample_rate),
+        window_size_samples(32 * (sample_rate / 1000))
+    {
+        if (sample_rate != 16000 && sample_rate != 8000) {
+            throw std::invalid_argument("Sample rate must be 16000 or 8000");
+        }
+
+        shared_session = SharedSession::get(model_path, config);
+        session = shared_session->session.get();
+    }
+
+    // Add a new stream with a fresh state, reusing the id of a removed stream if possible, and return its id
+    int64_t add_stream() {
+        size_t stream_id = 0;
+        while (stream_id < stream_active.size() && stream_active[stream_id]) {
+            stream_id++;
+        }
+        if (stream_id == stream_active.size()) {
+            stream_states.emplace_back(state_size);
+            stream_active.push_back(true);
+        } else {
+            std::fill(stream_states[stream_id].begin(), stream_states[stream_id].end(), 0.0f);
+            stream_active[stream_id] = true;
+        }
+        num_active_streams++;
+        return static_cast<int64_t>(stream_id);
+    }
+
+    void remove_stream(int64_t stream_id) {
+        check_stream(stream_id);
+        stream_active[stream_id] = false;
+        num_active_streams--;
+    }
+
+    size_t num_streams() const {
+        return num_active_streams;
+    }
+
+    // Run model to compute speech probability of exactly one window for each of the given streams, in a single batch
+    void predict(const int64_t* stream_ids, size_t num_streams, const float* data, size_t size, float* out) {
+        if (num_streams == 0) {
+            throw std::invalid_argument("At least one stream must be given");
+        }
+        if (size != num_streams * window_size_samples) {
+            throw std::invalid_argument("Input size must be equal to the number of streams times window_size_samples");
+        }
+        for (size_t b = 0; b < num_streams; b++) {
+            check_stream(stream_ids[b]);
+            for (size_t other = 0; other < b; other++) {
+                if (stream_ids[other] == stream_ids[b]) {
+                    throw std::invalid_argument("Each stream may only be given once per batch");
+                }
+            }
+        }
+
+        std::copy(data, data + size, get_batch_input(num_streams));
+        run(stream_ids, num_streams, out);
+    }
+
+    // Returns the buffer for the input of a batch of num_streams windows, laid out as {num_streams, window_size_samples}, to be filled before calling run
+    float* get_batch_input(size_t num_streams) {
+        ort_batch_input.resize(num_streams * window_size_samples);
+        return ort_batch_input.data();
+    }
+
+    // Run model on the batch input filled by the caller, for the given (valid and distinct) streams
+    void run(const int64_t* stream_ids, size_t num_streams, float* out) {
+        const int64_t batch_size = static_cast<int64_t>(num_streams);
+        ort_batch_state.resize(num_streams * state_size);
+        for (size_t b = 0; b < num_streams; b++) {
+            const float* stream_state = stream_states[stream_ids[b]].data();
+            for (size_t layer = 0; layer < 2; layer++) {
+                std::memcpy(&ort_batch_state[(layer * num_streams + b) * 128], stream_state + layer * 128, 128 * sizeof(float));
+            }
+        }
+        ort_input_node_shape[0] = batch_size;
+        ort_input_node_shape[1] = window_size_samples;
+        ort_state_node_shape[1] = batch_size;
+
+        Ort::Value input_ort = Ort::Value::CreateTensor<float>(memory_info, ort_batch_input.data(), ort_batch_input.size(), ort_input_node_shape, 2);
+        Ort::Value state_ort = Ort::Value::CreateTensor<float>(memory_info, ort_batch_state.data(), ort_batch_state.size(), ort_state_node_shape, 3);
+        Ort::Value sr_ort = Ort::Value::CreateTensor<int64_t>(memory_info, ort_sample_rate.data(), ort_sample_rate.size(), ort_sample_rate_node_shape, 1);
+
+        ort_inputs.clear();
+        ort_inputs.emplace_back(std::move(input_ort));
+        ort_inputs.emplace_back(std::move(state_ort));
+        ort_inputs.emplace_back(std::move(sr_ort));
+
+        ort_outputs = session->Run(
+            Ort::RunOptions{nullptr},
+            ort_input_node_names.data(), ort_inputs.data(), ort_inputs.size(),
+            output_node_names.data(), output_node_names.size());
+
+        const float* speech_probs = ort_outputs[0].GetTensorMutableData<float>();  // Shape {batch_size, 1}
+        const float* stateN_output = ort_outputs[1].GetTensorMutableData<float>();  // Shape {2, batch_size, 128}
+        for (size_t b = 0; b < num_streams; b++) {
+            out[b] = speech_probs[b];
+            float* stream_state = stream_states[stream_ids[b]].data();
+            for (size_t layer = 0; layer < 2; layer++) {
+                std::memcpy(stream_state + layer * 128, &stateN_output[(layer * num_streams + b) * 128], 128 * sizeof(float));
+            }
+        }
+    }
+};
+
+// Runs the model over interleaved multi-channel audio, keeping a state per channel, and processing each window of all channels in a single batched model run
+class SileroVADMultiChannel {
+private:
+    SileroVADBatch batch;
+    std::vector<int64_t> stream_ids;  // Of the channels in the batch, in order
+
+    std::vector<std::vector<float>> pending_samples;  // Per channel, samples fed but not yet processed, always fewer than window_size_samples
+    int64_t processed_samples = 0;  // Number of samples per channel run through the model so far
+
+    int input_format = SAMPLE_FORMAT_FLOAT32;
+    std::vector<std::unique_ptr<StreamingResampler>> resamplers;  // Per channel, only if the input sample rate differs from the model sample rate
+    std::vector<float> converted_samples;  // Interleaved
+    std::vector<float> channel_samples;  // Deinterleaved, for one channel
+    std::vector<std::vector<float>> resampled_samples;  // Per channel
+
+public:
+    const size_t num_channels;
+    const size_t window_size_samples;
+    const int sample_rate;
+
+    SileroVADMultiChannel(const std::string& model_path, int sample_rate, size_t num_channels, const SessionConfig& config) :
+        batch(model_path, sample_rate, config),
+        pending_samples(num_channels),
+        resampled_samples(num_channels),
+        num_channels(num_channels),
+        window_size_samples(batch.window_size_samples),
+        sample_rate(sample_rate)
+    {
+        if (num_channels == 0) {
+            throw std::invalid_argument("Number of channels must be positive");
+        }
+        for (size_t c = 0; c < num_channels; c++) {
+            stream_ids.push_back(batch.add_stream());
+            pending_samples[c].reserve(window_size_samples);
+        }
+    }
+
+    // Set the format and sample rate of input data passed to feed
+    void set_input(int format, int input_sample_rate) {
+        if (format < SAMPLE_FORMAT_FLOAT32 || format > SAMPLE_FORMAT_FLOAT64) {
+            throw std::invalid_argument("Invalid sample format");
+        }
+        input_format = format;
+        resamplers.clear();
+        if (input_sample_rate != sample_rate) {
+            for (size_t c = 0; c < num_channels; c++) {
+                resamplers.emplace_back(new StreamingResampler(input_sample_rate, sample_rate));
+            }
+        }
+    }
+
+    // Feed interleaved input data of any number of frames, deinterleaving, converting, and resampling it to the model sample rate as needed.
+    // For each window completed, writes the speech probability of each channel to out (laid out as {window, channel}) and the window start to out_offsets.
+    size_t feed(const void* data, size_t num_frames, float* out, int64_t* out_offsets, size_t max_windows) {
+        converted_samples.resize(num_frames * num_channels);
+        convert_samples(data, num_frames * num_channels, input_format, converted_samples.data());
+        size_t num_new_samples = num_frames;
+        if (!resamplers.empty()) {
+            channel_samples.resize(num_frames);
+            for (size_t c = 0; c < num_channels; c++) {
+                for (size_t f = 0; f < num_frames; f++) {
+                    channel_samples[f] = converted_samples[f * num_channels + c];
+                }
+                resampled_samples[c].clear();
+                resamplers[c]->process(channel_samples.data(), num_frames, resampled_samples[c]);
+            }
+            num_new_samples = resampled_samples[0].size();  // The same for all channels, as their resamplers are in lockstep
+        }
+        const size_t num_windows = (pending_samples[0].size() + num_new_samples) / window_size_samples;
+        if (num_windows > max_windows) {
+            throw std::invalid_argument("Output size must be at least the number of windows completed");
+        }
+
+        // Deinterleave into the pending samples of each channel, then run each complete window of all channels as a batch
+        for (size_t c = 0; c < num_channels; c++) {
+            std::vector<float>& channel_pending = pending_samples[c];
+            if (!resamplers.empty()) {
+                channel_pending.insert(channel_pending.end(), resampled_samples[c].begin(), resampled_samples[c].end());
+            } else {
+                for (size_t f = 0; f < num_frames; f++) {
+                    channel_pending.push_back(converted_samples[f * num_channels + c]);
+                }
+            }
+        }
+        for (size_t w = 0; w < num_windows; w++) {
+            float* batch_input = batch.get_batch_input(num_channels);
+            for (size_t c = 0; c < num_channels; c++) {
+                std::memcpy(batch_input + c * window_size_samples, &pending_samples[c][w * window_size_samples], window_size_samples * sizeof(float));
+            }
+            batch.run(stream_ids.data(), num_channels, out + w * num_channels);
+            out_offsets[w] = processed_samples;
+            processed_samples += window_size_samples;
+        }
+        for (size_t c = 0; c < num_channels; c++) {
+            pending_samples[c].erase(pending_samples[c].begin(), pending_samples[c].begin() + num_windows * window_size_samples);
+        }
+        return num_windows;
+    }
+
+    size_t get_pending_samples() const {
+        return pending_samples[0].size();
+    }
+
+    // Reset to the start of a new stream, clearing the state of each channel, buffered samples, resampler history, and sample offset
+    void reset() {
+        for (size_t c = 0; c < num_channels; c++) {
+            batch.remove_stream(stream_ids[c]);
+        }
+        for (size_t c = 0; c < num_channels; c++) {
+            stream_ids[c] = batch.add_stream();
+            pending_samples[c].clear();
+        }
+        for (auto& resampler : resamplers) {
+            resampler->reset();
+        }
+        processed_samples = 0;
+    }
 };
 
 #ifdef _WIN32
@@ -99,9 +1015,10 @@ public:
 #endif
 
 extern "C" {
-    EXPORT_API SileroVAD* SileroVAD_new(const char* model_path, int sample_rate) {
+    // The config may be null to use the default config
+    EXPORT_API SileroVAD* SileroVAD_new(const char* model_path, int sample_rate, const SessionConfig* config) {
         try {
-            return new SileroVAD(model_path, sample_rate);
+            return new SileroVAD(model_path, sample_rate, config ? *config : SessionConfig());
         } catch (const std::exception& e) {
             std::cerr << "Error in SileroVAD_new: " << e.what() << std::endl;
             return nullptr;
@@ -112,11 +1029,253 @@ extern "C" {
         delete vad;
     }
 
-    EXPORT_API float SileroVAD_process(SileroVAD* vad, float* data, size_t size) {
-        return vad->predict(data, size);
+    EXPORT_API float SileroVAD_process(SileroVAD* vad, const void* data, size_t size) {
+        return vad->predict(vad->get_window_input(data, size), size);
+    }
+
+    // Returns the number of windows processed, or -1 on error
+    EXPORT_API int64_t SileroVAD_process_many(SileroVAD* vad, const void* data, size_t size, float* out, size_t out_size) {
+        try {
+            return static_cast<int64_t>(vad->predict_many(vad->get_window_input(data, size), size, out, out_size));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_process_many: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns the number of windows completed, or -1 on error
+    EXPORT_API int64_t SileroVAD_feed(SileroVAD* vad, const void* data, size_t num_samples, float* out, int64_t* out_offsets, size_t out_size) {
+        try {
+            return static_cast<int64_t>(vad->feed_input(data, num_samples, out, out_offsets, out_size));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_feed: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVAD_set_input(SileroVAD* vad, int format, int input_sample_rate) {
+        try {
+            vad->set_input(format, input_sample_rate);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_set_input: " << e.what() << std::endl;
+            return -1;
+        }
     }
 
     EXPORT_API size_t SileroVAD_get_window_size_samples(SileroVAD* vad) {
         return vad->window_size_samples;
     }
+
+    EXPORT_API size_t SileroVAD_get_pending_samples(SileroVAD* vad) {
+        return vad->get_pending_samples();
+    }
+
+    EXPORT_API void SileroVAD_reset(SileroVAD* vad) {
+        vad->reset();
+    }
+
+    EXPORT_API size_t SileroVAD_get_state_size(SileroVAD* vad) {
+        return vad->get_state_size();
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVAD_get_state(SileroVAD* vad, float* out, size_t size) {
+        try {
+            vad->get_state(out, size);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_get_state: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVAD_set_state(SileroVAD* vad, const float* data, size_t size) {
+        try {
+            vad->set_state(data, size);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_set_state: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVAD_set_energy_gate(SileroVAD* vad, int mode, float floor, float probability, int reset_state) {
+        try {
+            vad->set_energy_gate(mode, floor, probability, reset_state != 0);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_set_energy_gate: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    EXPORT_API void SileroVAD_set_stats_enabled(SileroVAD* vad, int enabled) {
+        vad->set_stats_enabled(enabled != 0);
+    }
+
+    EXPORT_API void SileroVAD_get_stats(SileroVAD* vad, InferenceStats* out) {
+        *out = vad->get_stats();
+    }
+
+    EXPORT_API void SileroVAD_reset_stats(SileroVAD* vad) {
+        vad->reset_stats();
+    }
+
+    // Writes the null-terminated path of the trace file (empty if profiling was not enabled) to out, and returns its length, or -1 on error
+    EXPORT_API int64_t SileroVAD_end_profiling(SileroVAD* vad, char* out, size_t out_size) {
+        try {
+            const std::string path = vad->end_profiling();
+            if (path.size() >= out_size) {
+                throw std::invalid_argument("Output size must be greater than the length of the path");
+            }
+            std::memcpy(out, path.c_str(), path.size() + 1);
+            return static_cast<int64_t>(path.size());
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVAD_end_profiling: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // The config may be null to use the default config
+    EXPORT_API SileroVADBatch* SileroVADBatch_new(const char* model_path, int sample_rate, const SessionConfig* config) {
+        try {
+            return new SileroVADBatch(model_path, sample_rate, config ? *config : SessionConfig());
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADBatch_new: " << e.what() << std::endl;
+            return nullptr;
+        }
+    }
+
+    EXPORT_API void SileroVADBatch_delete(SileroVADBatch* batch) {
+        delete batch;
+    }
+
+    EXPORT_API size_t SileroVADBatch_get_window_size_samples(SileroVADBatch* batch) {
+        return batch->window_size_samples;
+    }
+
+    EXPORT_API size_t SileroVADBatch_get_num_streams(SileroVADBatch* batch) {
+        return batch->num_streams();
+    }
+
+    // Returns the id of the new stream
+    EXPORT_API int64_t SileroVADBatch_add_stream(SileroVADBatch* batch) {
+        return batch->add_stream();
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVADBatch_remove_stream(SileroVADBatch* batch, int64_t stream_id) {
+        try {
+            batch->remove_stream(stream_id);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADBatch_remove_stream: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVADBatch_process(SileroVADBatch* batch, const int64_t* stream_ids, size_t num_streams, const float* data, size_t size, float* out) {
+        try {
+            batch->predict(stream_ids, num_streams, data, size, out);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADBatch_process: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // The config may be null to use the default config
+    EXPORT_API SileroVADMultiChannel* SileroVADMultiChannel_new(const char* model_path, int sample_rate, size_t num_channels, const SessionConfig* config) {
+        try {
+            return new SileroVADMultiChannel(model_path, sample_rate, num_channels, config ? *config : SessionConfig());
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADMultiChannel_new: " << e.what() << std::endl;
+            return nullptr;
+        }
+    }
+
+    EXPORT_API void SileroVADMultiChannel_delete(SileroVADMultiChannel* vad) {
+        delete vad;
+    }
+
+    EXPORT_API size_t SileroVADMultiChannel_get_window_size_samples(SileroVADMultiChannel* vad) {
+        return vad->window_size_samples;
+    }
+
+    // Returns 0 on success, or -1 on error
+    EXPORT_API int SileroVADMultiChannel_set_input(SileroVADMultiChannel* vad, int format, int input_sample_rate) {
+        try {
+            vad->set_input(format, input_sample_rate);
+            return 0;
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADMultiChannel_set_input: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns the number of windows completed, or -1 on error
+    EXPORT_API int64_t SileroVADMultiChannel_feed(SileroVADMultiChannel* vad, const void* data, size_t num_frames, float* out, int64_t* out_offsets, size_t out_size) {
+        try {
+            return static_cast<int64_t>(vad->feed(data, num_frames, out, out_offsets, out_size));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SileroVADMultiChannel_feed: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    EXPORT_API size_t SileroVADMultiChannel_get_pending_samples(SileroVADMultiChannel* vad) {
+        return vad->get_pending_samples();
+    }
+
+    EXPORT_API void SileroVADMultiChannel_reset(SileroVADMultiChannel* vad) {
+        vad->reset();
+    }
+
+    EXPORT_API SpeechSegmenter* SpeechSegmenter_new(SileroVAD* vad, float threshold, float neg_threshold, int64_t min_speech_samples, int64_t min_silence_samples, int64_t speech_pad_samples, int64_t max_speech_samples) {
+        try {
+            return new SpeechSegmenter(vad, SegmenterConfig{threshold, neg_threshold, min_speech_samples, min_silence_samples, speech_pad_samples, max_speech_samples});
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SpeechSegmenter_new: " << e.what() << std::endl;
+            return nullptr;
+        }
+    }
+
+    EXPORT_API void SpeechSegmenter_delete(SpeechSegmenter* segmenter) {
+        delete segmenter;
+    }
+
+    // Returns the number of events, or -1 on error
+    EXPORT_API int64_t SpeechSegmenter_process(SpeechSegmenter* segmenter, const void* data, size_t num_samples, SegmentEvent* events, size_t max_events) {
+        try {
+            return static_cast<int64_t>(segmenter->process(data, num_samples, events, max_events));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SpeechSegmenter_process: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns the number of events, or -1 on error
+    EXPORT_API int64_t SpeechSegmenter_process_scores(SpeechSegmenter* segmenter, const float* scores, size_t num_scores, SegmentEvent* events, size_t max_events) {
+        try {
+            return static_cast<int64_t>(segmenter->process_scores(scores, num_scores, events, max_events));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SpeechSegmenter_process_scores: " << e.what() << std::endl;
+            return -1;
+        }
+    }
+
+    // Returns the number of events, or -1 on error
+    EXPORT_API int64_t SpeechSegmenter_flush(SpeechSegmenter* segmenter, SegmentEvent* events, size_t max_events) {
+        try {
+            return static_cast<int64_t>(segmenter->flush(events, max_events));
+        } catch (const std::exception& e) {
+            std::cerr << "Error in SpeechSegmenter_flush: " << e.what() << std::endl;
+            return -1;
+        }
+    }
 }
@@ -2,42 +2,135 @@ import array
 import ctypes
 import os
 import platform
+import threading
+
+from ._buffer import _Buffer
+
+# Sample format names, mapped to the native format id, the sample size in bytes, and the accepted buffer typecodes (the first being the array typecode)
+_SAMPLE_FORMATS = {
+    'float32': (0, 4, ('f',)),
+    'int16': (1, 2, ('h',)),
+    'int32': (2, 4, ('i', 'l')),
+    'uint8': (3, 1, ('B',)),
+    'float64': (4, 8, ('d',)),
+}
+
+# The sample size and typecodes of 32-bit float buffers, as used for the data of `process` and for scores and model states
+_FLOAT32_SIZE, _FLOAT32_TYPECODES = _SAMPLE_FORMATS['float32'][1:]
+
+# Energy gate mode names, mapped to the native mode id
+_ENERGY_GATE_MODES = {'rms': 1, 'peak': 2}
+
+# Execution mode and graph optimization level names, mapped to the ONNX Runtime enum values
+_EXECUTION_MODES = {'sequential': 0, 'parallel': 1}
+_GRAPH_OPTIMIZATION_LEVELS = {'disabled': 0, 'basic': 1, 'extended': 2, 'all': 99}
+
+class _SessionConfig(ctypes.Structure):
+    _fields_ = [
+        ('intra_op_num_threads', ctypes.c_int),
+        ('inter_op_num_threads', ctypes.c_int),
+        ('execution_mode', ctypes.c_int),
+        ('graph_optimization_level', ctypes.c_int),
+        ('enable_cpu_mem_arena', ctypes.c_int),
+        ('enable_mem_pattern', ctypes.c_int),
+        ('optimized_model_path', ctypes.c_char_p),
+        ('profile_file_prefix', ctypes.c_char_p),
+    ]
+
+# Number of buckets of the inference latency histogram: bucket 0 counts times under 1 microsecond, bucket i times in [2**(i-1), 2**i) microseconds, and the last bucket all longer times
+_STATS_HISTOGRAM_BUCKETS = 32
+
+class _InferenceStats(ctypes.Structure):
+    _fields_ = [
+        ('num_windows', ctypes.c_int64),
+        ('num_gated_windows', ctypes.c_int64),
+        ('total_ns', ctypes.c_int64),
+        ('last_ns', ctypes.c_int64),
+        ('min_ns', ctypes.c_int64),
+        ('max_ns', ctypes.c_int64),
+        ('histogram', ctypes.c_int64 * _STATS_HISTOGRAM_BUCKETS),
+    ]
+
+def _make_session_config(intra_op_num_threads=1, inter_op_num_threads=1, execution_mode='sequential', graph_optimization_level='all', enable_cpu_mem_arena=True, enable_mem_pattern=True, optimized_model_path=None, profile_file_prefix=None):
+    if execution_mode not in _EXECUTION_MODES:
+        raise ValueError(f"Execution mode must be one of: {', '.join(_EXECUTION_MODES)}")
+    if graph_optimization_level not in _GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(f"Graph optimization level must be one of: {', '.join(_GRAPH_OPTIMIZATION_LEVELS)}")
+    if intra_op_num_threads < 0 or inter_op_num_threads < 0:
+        raise ValueError("Numbers of threads must not be negative")
+    return _SessionConfig(
+        intra_op_num_threads,
+        inter_op_num_threads,
+        _EXECUTION_MODES[execution_mode],
+        _GRAPH_OPTIMIZATION_LEVELS[graph_optimization_level],
+        bool(enable_cpu_mem_arena),
+        bool(enable_mem_pattern),
+        optimized_model_path.encode('utf-8') if optimized_model_path is not None else None,
+        profile_file_prefix.encode('utf-8') if profile_file_prefix is not None else None,
+    )
 
 class SileroVAD:
 
-    def __init__(self, sample_rate, model_path=None):
+    def __init__(self, sample_rate, model_path=None, input_format='float32', input_sample_rate=None, enable_stats=False, energy_gate=None, **session_options):
         """
         Initializes the SileroVAD object.
 
+        The model is loaded only once per process for each model path and set of session options: all SileroVAD (and SileroVADBatch) objects using the same model and options share a single ONNX Runtime session, so each object only holds its own model state for one audio stream, and is cheap to create while any other object using the model is alive.
+
         Args:
             sample_rate (int): The sample rate of the audio.
             model_path (str, optional): The path to the model file. If not provided, the default model included in the package will be used.
+            input_format (str, optional): The format of the PCM samples passed to `process`, `process_many`, and `feed`: one of `'float32'` (normalized to the range [-1, 1]), `'int16'`, `'int32'`, `'uint8'`, or `'float64'` (normalized), all in native byte order. Samples are converted to normalized 32-bit floats natively.
+            input_sample_rate (int, optional): The sample rate of the audio passed to `feed`, if different from `sample_rate` (e.g. 44100 or 48000). It is resampled natively to `sample_rate` by a streaming resampler, which keeps its state between calls. `process` and `process_many` take whole windows at `sample_rate`, so they cannot be used if this is set.
+            enable_stats (bool, optional): Whether to record inference stats natively around each model run, available from `stats`. It can also be changed later with `stats_enabled`.
+            energy_gate (optional): The energy gate configuration, to skip running the model on quiet windows: either a mode (`'rms'` or `'peak'`) with the default settings, or a dict of the arguments for `set_energy_gate`. If not provided, every window is run through the model.
+            **session_options: Options for the ONNX Runtime session:
+                intra_op_num_threads (int, optional): The number of threads used to parallelize execution within operators (default 1; 0 lets ONNX Runtime choose).
+                inter_op_num_threads (int, optional): The number of threads used to parallelize execution between operators, in parallel execution mode (default 1; 0 lets ONNX Runtime choose).
+                execution_mode (str, optional): Either `'sequential'` (the default) or `'parallel'`.
+                graph_optimization_level (str, optional): One of `'disabled'`, `'basic'`, `'extended'`, or `'all'` (the default).
+                enable_cpu_mem_arena (bool, optional): Whether to use a memory arena for CPU allocations (default True).
+                enable_mem_pattern (bool, optional): Whether to preallocate memory based on the allocation pattern of previous runs (default True).
+                optimized_model_path (str, optional): A path to cache the optimized model at. If the file exists, it is loaded instead of the model, skipping graph optimization, which speeds up startup; otherwise (or if it fails to load) the model is optimized and saved there, through a temporary file that is renamed into place, so that processes starting concurrently never load a partially written file. The cached model is only valid for the same model and options, and with a `graph_optimization_level` of `'all'` may be specific to the hardware it was created on, so use `'extended'` if it will be shared between machines.
+                profile_file_prefix (str, optional): If provided, enables the ONNX Runtime profiler, which records every model run of the session (shared by all objects with the same options) and writes a JSON trace file whose name starts with this prefix when `end_profiling` is called.
 
         Returns:
             SileroVAD: The SileroVAD object.
         """
         if model_path is None:
             model_path = self._get_model_path()
+        if input_format not in _SAMPLE_FORMATS:
+            raise ValueError(f"Input format must be one of: {', '.join(_SAMPLE_FORMATS)}")
+        if input_sample_rate is None:
+            input_sample_rate = sample_rate
+        session_config = _make_session_config(**session_options)
 
-        # Load the shared library
-        self._lib = ctypes.CDLL(self._get_lib_path())
-
-        # Define function prototypes
-        self._lib.SileroVAD_new.argtypes = [ctypes.c_char_p, ctypes.c_int]
-        self._lib.SileroVAD_new.restype = ctypes.c_void_p
-
-        self._lib.SileroVAD_delete.argtypes = [ctypes.c_void_p]
-
-        self._lib.SileroVAD_get_window_size_samples.argtypes = [ctypes.c_void_p]
-        self._lib.SileroVAD_get_window_size_samples.restype = ctypes.c_size_t
-
-        self._lib.SileroVAD_process.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_float), ctypes.c_size_t]
-        self._lib.SileroVAD_process.restype = ctypes.c_float
+        self._lib = _load_lib()
 
         # Create the C++ object
-        self._obj = self._lib.SileroVAD_new(model_path.encode('utf-8'), sample_rate)
+        self._obj = self._lib.SileroVAD_new(model_path.encode('utf-8'), sample_rate, ctypes.byref(session_config))
+        if not self._obj:
+            raise RuntimeError("Failed to create SileroVAD")
         self._sample_rate = sample_rate  # Constant
         self._window_size_samples = self._lib.SileroVAD_get_window_size_samples(self._obj)  # Constant
+        self._feed_capacity = 0
+        self._state_size = self._lib.SileroVAD_get_state_size(self._obj)  # Constant
+        self._data_buffer = _Buffer()
+        self._out_buffer = _Buffer()
+        self._stats = _InferenceStats()
+        self._stats_enabled = False
+        self.stats_enabled = enable_stats
+        self._energy_gate = None
+        if energy_gate is not None:
+            if isinstance(energy_gate, str):
+                energy_gate = dict(mode=energy_gate)
+            self.set_energy_gate(**energy_gate)
+
+        format_id, self._input_sample_size, self._input_typecodes = _SAMPLE_FORMATS[input_format]
+        if self._lib.SileroVAD_set_input(self._obj, format_id, input_sample_rate) != 0:
+            raise ValueError(f"Unsupported input sample rate: {input_sample_rate}")
+        self._input_format = input_format  # Constant
+        self._input_sample_rate = input_sample_rate  # Constant
 
     def __del__(self):
         """
@@ -67,53 +160,261 @@ class SileroVAD:
         """
         return self._window_size_samples
 
+    @property
+    def input_format(self):
+        """
+        Returns the format of the PCM samples passed to `feed`.
+
+        Returns:
+            str: The input sample format.
+        """
+        return self._input_format
+
+    @property
+    def input_sample_rate(self):
+        """
+        Returns the sample rate of the audio passed to `feed`.
+
+        Returns:
+            int: The input sample rate.
+        """
+        return self._input_sample_rate
+
+    @property
+    def pending_samples(self):
+        """
+        Returns the number of samples fed with `feed` that are buffered, waiting for a complete window. These are counted at the model sample rate, after any resampling.
+
+        Returns:
+            int: The number of buffered samples, always less than the window size.
+        """
+        return self._lib.SileroVAD_get_pending_samples(self._obj)
+
+    @property
+    def stats_enabled(self):
+        """
+        Returns whether inference stats are being recorded.
+
+        Returns:
+            bool: Whether inference stats are being recorded.
+        """
+        return self._stats_enabled
+
+    @stats_enabled.setter
+    def stats_enabled(self, enabled):
+        self._lib.SileroVAD_set_stats_enabled(self._obj, bool(enabled))
+        self._stats_enabled = bool(enabled)
+
+    @property
+    def stats(self):
+        """
+        Returns the inference stats of this object, recorded natively around each model run while `stats_enabled` is set (except `num_gated_windows`, which is always counted). They are kept by `reset`, as they describe the object rather than the stream, and can be cleared with `reset_stats`.
+
+        Returns:
+            dict: The stats, with keys `'num_windows'` (the number of windows run through the model), `'num_gated_windows'` (the number of windows skipped by the energy gate, which are not included in the other stats), `'total_ns'`, `'last_ns'`, `'min_ns'`, `'max_ns'`, and `'mean_ns'` (the inference times in nanoseconds), and `'histogram'` (a list of counts of inference times, where bucket 0 counts times under 1 microsecond, bucket i times in [2**(i-1), 2**i) microseconds, and the last bucket all longer times).
+        """
+        self._lib.SileroVAD_get_stats(self._obj, ctypes.byref(self._stats))
+        stats = self._stats
+        return dict(
+            num_windows=stats.num_windows,
+            num_gated_windows=stats.num_gated_windows,
+            total_ns=stats.total_ns,
+            last_ns=stats.last_ns,
+            min_ns=stats.min_ns,
+            max_ns=stats.max_ns,
+            mean_ns=stats.total_ns / stats.num_windows if stats.num_windows else 0.0,
+            histogram=list(stats.histogram),
+        )
+
+    @property
+    def energy_gate(self):
+        """
+        Returns the energy gate configuration.
+
+        Returns:
+            dict: The arguments of `set_energy_gate` in effect, or None if the energy gate is disabled.
+        """
+        return dict(self._energy_gate) if self._energy_gate is not None else None
+
+    def set_energy_gate(self, mode='rms', floor_db=-60.0, probability=0.0, reset_state=False):
+        """
+        Configures the energy gate, which measures the energy of each window natively, and skips running the model on windows below a floor, returning a fixed VAD score for them instead. This saves most of the inference cost on audio that is mostly silence or line noise, at the cost of possibly missing very quiet speech: use `stats` (with `num_gated_windows`) to measure the trade-off.
+
+        The gate applies to windows processed by `process`, `process_many`, and `feed` (and so by `SpeechSegmenter`).
+
+        Args:
+            mode (str, optional): The measure of energy: `'rms'` (the default, the root mean square of the samples) or `'peak'` (the maximum absolute sample), or None to disable the gate.
+            floor_db (float, optional): The energy below which windows are gated, in dB relative to full scale (an amplitude of 1). The default of -60 dBFS is well below normal speech levels.
+            probability (float, optional): The VAD score returned for gated windows.
+            reset_state (bool, optional): What happens to the recurrent model state on gated windows. If False (the default), it is left unchanged, so the model continues from the last window it ran on, as if the gated windows had not occurred; this is best when gated stretches are short (such as pauses between words). If True, it is reset to zeros, so the model restarts as at the start of a stream, dropping any context from before the quiet stretch.
+
+        Raises:
+            ValueError: If the mode or probability is invalid.
+        """
+        if mode is None:
+            if self._lib.SileroVAD_set_energy_gate(self._obj, 0, 0.0, 0.0, False) != 0:
+                raise RuntimeError("Failed to disable energy gate")
+            self._energy_gate = None
+            return
+        if mode not in _ENERGY_GATE_MODES:
+            raise ValueError(f"Energy gate mode must be one of: {', '.join(_ENERGY_GATE_MODES)}")
+        if not 0 <= probability <= 1:
+            raise ValueError("Probability must be between 0 and 1")
+        floor = 10 ** (floor_db / 20)
+        if self._lib.SileroVAD_set_energy_gate(self._obj, _ENERGY_GATE_MODES[mode], floor, probability, bool(reset_state)) != 0:
+            raise RuntimeError("Failed to set energy gate")
+        self._energy_gate = dict(mode=mode, floor_db=floor_db, probability=probability, reset_state=bool(reset_state))
+
+    def reset_stats(self):
+        """
+        Clears the inference stats.
+        """
+        self._lib.SileroVAD_reset_stats(self._obj)
+
+    def end_profiling(self):
+        """
+        Stops the ONNX Runtime profiler enabled with the `profile_file_prefix` session option, and writes its trace file. The profiler belongs to the session, so this ends it for all objects sharing the session.
+
+        Returns:
+            str: The path of the trace file, or None if profiling was not enabled.
+        """
+        path = ctypes.create_string_buffer(4096)
+        length = self._lib.SileroVAD_end_profiling(self._obj, path, len(path))
+        if length < 0:
+            raise RuntimeError("Failed to end profiling")
+        return path.value.decode('utf-8') if length > 0 else None
+
     def process(self, data):
         """
         Process the input data using the Silero VAD model, and return the VAD score.
 
-        Note: If you want to pass in a `numpy.ndarray`, you have various options: convert it to a supported `ctypes.Array` using `np.ctypeslib.as_ctypes(np_array)`, or pass in `memoryview(np_array.data)` (the `.data` is required in order to obtain a writable view), or pass in `np_array.tobytes()`. The first two options are more efficient as they share the data from the original array without copying it.
-        Note: You cannot pass in read-only data. While the data should not be modified by the function, it must be writable to be able to run the model on it without copying it.
+        Note: Any contiguous object supporting the buffer protocol is processed in place, without copying it, including read-only data such as `bytes` and `numpy.ndarray` objects (e.g. of dtype `float32`, or slices of a larger array). Other sequences, such as lists of floats, are converted first. Samples in an `input_format` other than `'float32'` are converted natively into a scratch buffer.
 
         Args:
-            data: The input data to be processed. It can be of type `bytes`, `bytearray`, `memoryview`, `array.array`, or `ctypes.Array`. It must consist of 32-bit floating-point PCM audio samples, normalized to the range [-1, 1], mono channel, and at the sample rate specified during initialization. The length of the data in samples must be exactly equal to the window size, which is 32ms at the sample rate.
+            data: The input data to be processed. It can be of type `bytes`, `bytearray`, `memoryview`, `array.array`, `ctypes.Array`, `numpy.ndarray`, or any other contiguous buffer of samples or of raw bytes, or a sequence of numbers. It must consist of PCM audio samples in the `input_format` (by default 32-bit floats, normalized to the range [-1, 1]), mono channel, and at the sample rate specified during initialization. The length of the data in samples must be exactly equal to the window size, which is 32ms at the sample rate.
 
         Returns:
             float: The VAD score (likelihood of voice activity) between 0 and 1 (inclusive).
 
         Raises:
-            ValueError: If the data is empty, has an invalid length, or is of an unsupported type.
-        """
-        length = len(data)
-        if length <= 0:
-            raise ValueError("Data must not be empty")
-        if isinstance(data, (bytes, bytearray)):
-            if isinstance(data, bytes):
-                data = bytearray(data)
-            if length % ctypes.sizeof(ctypes.c_float) != 0:
-                raise ValueError(f"Data length must be a multiple of the size of a float ({ctypes.sizeof(ctypes.c_float)} bytes)")
-            length = length // ctypes.sizeof(ctypes.c_float)
-            float_array = (ctypes.c_float * length).from_buffer(data)
-        elif isinstance(data, memoryview):
-            if data.ndim != 1:
-                raise ValueError("Memoryview must be one-dimensional")
-            if data.itemsize != ctypes.sizeof(ctypes.c_float):
-                raise ValueError(f"Memoryview item size must be the size of a float ({ctypes.sizeof(ctypes.c_float)} bytes)")
-            if not data.contiguous:
-                raise ValueError("Memoryview must be contiguous")
-            if data.readonly:
-                raise ValueError("Memoryview must be writable")
-            float_array = (ctypes.c_float * length).from_buffer(data)
-        elif isinstance(data, array.array):
-            if data.typecode != 'f':
-                raise ValueError("Array must be of type 'f' (float)")
-            float_array = (ctypes.c_float * length).from_buffer(data)
-        elif isinstance(data, ctypes.Array):
-            float_array = data
-        else:
-            float_array = (ctypes.c_float * length)(*data)
-        if length != self.window_size_samples:
-            raise ValueError(f"Data length must be equal to the window size ({self.window_size_samples})")
-        return self._lib.SileroVAD_process(self._obj, float_array, length)
+            ValueError: If the data is empty, has an invalid length, or is not contiguous or of an unsupported sample type, or if an `input_sample_rate` other than `sample_rate` was set.
+            TypeError: If the data is not a buffer or a sequence of numbers.
+        """
+        self._check_window_input()
+        with self._acquire_input(data) as (address, length):
+            if length != self._window_size_samples:
+                raise ValueError(f"Data length must be equal to the window size ({self._window_size_samples})")
+            return self._lib.SileroVAD_process(self._obj, address, length)
+
+    def process_many(self, data, out=None):
+        """
+        Process the input data as consecutive windows using the Silero VAD model, and return the VAD score of each window.
+
+        All of the windows are processed in a single call into the native library, carrying the model state from one window to the next, exactly as if each window had been passed to `process` in turn.
+
+        Args:
+            data: The input data to be processed. It supports the same types and audio formats as `process`, but its length in samples must be a (nonzero) multiple of the window size.
+            out (optional): A writable, contiguous buffer of 32-bit floats to store the VAD scores in, with room for at least one score per window, such as a `bytearray`, `memoryview`, `array.array`, `ctypes.Array`, or `numpy.ndarray`. Reusing it between calls avoids allocating any memory. If not provided, a new `array.array` is allocated.
+
+        Returns:
+            The buffer containing the VAD scores: `out` if provided, otherwise a new `array.array` of type 'f' with one score per window.
+
+        Raises:
+            ValueError: If the data is empty, has an invalid length, or is not contiguous or of an unsupported sample type, if the output buffer is too small, not writable, or of an unsupported type, or if an `input_sample_rate` other than `sample_rate` was set.
+            TypeError: If the data is not a buffer or a sequence of numbers, or the output buffer is not a buffer.
+        """
+        self._check_window_input()
+        with self._acquire_input(data) as (address, length):
+            if length % self._window_size_samples != 0:
+                raise ValueError(f"Data length must be a multiple of the window size ({self._window_size_samples})")
+            num_windows = length // self._window_size_samples
+            if out is None:
+                out = array.array('f', bytes(num_windows * _FLOAT32_SIZE))
+            with self._out_buffer.acquire(out, _FLOAT32_SIZE, _FLOAT32_TYPECODES, writable=True) as (out_address, out_length):
+                if out_length < num_windows:
+                    raise ValueError(f"Output buffer must have room for at least {num_windows} scores")
+                if self._lib.SileroVAD_process_many(self._obj, address, length, out_address, out_length) < 0:
+                    raise RuntimeError("Failed to process data")
+        return out
+
+    def feed(self, data):
+        """
+        Feed the next input data of a stream, of any length, and return the VAD score of each window completed by it.
+
+        Samples are buffered natively until a complete window is available, so the data can be supplied in chunks of any size (e.g. as network packets arrive), and each window is run through the model as soon as it is complete. For float32 input at the model sample rate, complete windows are processed directly from the data without copying; otherwise the data is converted and resampled natively according to `input_format` and `input_sample_rate`.
+
+        Note: `feed` should not be mixed with `process` or `process_many` on the same object, as they bypass the buffer.
+
+        Args:
+            data: The input data to be processed. It supports the same types as `process` (buffers of samples of the input format, or of raw bytes), but can be of any length, and must consist of mono PCM audio samples in the input format and at the input sample rate specified during initialization.
+
+        Returns:
+            list: The results, as tuples of `(offset, score)`, where `offset` is the offset of the start of the window from the start of the stream in samples (at the model sample rate), and `score` is the VAD score of the window.
+
+        Raises:
+            ValueError: If the data is not contiguous or of an unsupported sample type.
+            TypeError: If the data is not a buffer or a sequence of numbers.
+        """
+        if len(data) == 0:
+            return []
+        with self._acquire_input(data) as (address, length):
+            max_windows = (length * self._sample_rate // self._input_sample_rate + 1) // self._window_size_samples + 1
+            if self._feed_capacity < max_windows:
+                self._feed_capacity = max_windows
+                self._feed_scores = (ctypes.c_float * max_windows)()
+                self._feed_offsets = (ctypes.c_int64 * max_windows)()
+            num_windows = self._lib.SileroVAD_feed(self._obj, address, length, self._feed_scores, self._feed_offsets, self._feed_capacity)
+        if num_windows < 0:
+            raise RuntimeError("Failed to process data")
+        return list(zip(self._feed_offsets[:num_windows], self._feed_scores[:num_windows]))
+
+    def reset(self):
+        """
+        Reset the object to the start of a new stream, without reloading the model: clears the model state, any samples buffered by `feed` (and the resampler history), and the sample offset.
+        """
+        self._lib.SileroVAD_reset(self._obj)
+
+    def get_state(self):
+        """
+        Returns a copy of the recurrent model state, which can be restored later with `set_state`, possibly on another SileroVAD object (e.g. to migrate a stream to another worker).
+
+        Note: The state does not include any samples buffered by `feed`, or the sample offset.
+
+        Returns:
+            array.array: The model state, as an array of type 'f'.
+        """
+        state = array.array('f', bytes(self._state_size * _FLOAT32_SIZE))
+        address, _ = state.buffer_info()
+        if self._lib.SileroVAD_get_state(self._obj, address, self._state_size) != 0:
+            raise RuntimeError("Failed to get state")
+        return state
+
+    def set_state(self, state):
+        """
+        Restores the recurrent model state, as returned by `get_state`.
+
+        Args:
+            state: The model state. It supports the same types as the data for `process`.
+
+        Raises:
+            ValueError: If the state has an invalid length, or is not contiguous or of an unsupported sample type.
+            TypeError: If the state is not a buffer or a sequence of numbers.
+        """
+        with self._data_buffer.acquire(state, _FLOAT32_SIZE, _FLOAT32_TYPECODES) as (address, length):
+            if length != self._state_size:
+                raise ValueError(f"State length must be equal to the model state size ({self._state_size})")
+            if self._lib.SileroVAD_set_state(self._obj, address, length) != 0:
+                raise RuntimeError("Failed to set state")
+
+    def _check_window_input(self):
+        if self._input_sample_rate != self._sample_rate:
+            raise ValueError("process and process_many take audio at the model sample rate; use feed for audio at another input_sample_rate")
+
+    def _acquire_input(self, data):
+        """
+        Acquires a view of the data as samples in the input format, for use in a `with` block, yielding its address and length in samples.
+        """
+        return self._data_buffer.acquire(data, self._input_sample_size, self._input_typecodes)
 
     @staticmethod
     def _get_lib_name():
@@ -136,3 +437,119 @@ class SileroVAD:
         # TODO: Implement a proper modern way to get the model path
         # Data Files Support - setuptools 75.1.0.post20240916 documentation (https://setuptools.pypa.io/en/latest/userguide/datafiles.html#accessing-data-files-at-runtime)
         return os.path.join(os.path.dirname(__file__), 'data', 'silero_vad.onnx')
+
+
+_lib = None
+_lib_lock = threading.Lock()
+
+def _load_lib():
+    """
+    Returns the shared library, loading it and defining its function prototypes on first use.
+    """
+    global _lib
+    with _lib_lock:
+        if _lib is not None:
+            return _lib
+
+        # Load the shared library
+        lib = ctypes.CDLL(SileroVAD._get_lib_path())
+
+        # Define function prototypes
+        lib.SileroVAD_new.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(_SessionConfig)]
+        lib.SileroVAD_new.restype = ctypes.c_void_p
+
+        lib.SileroVAD_delete.argtypes = [ctypes.c_void_p]
+
+        lib.SileroVAD_get_window_size_samples.argtypes = [ctypes.c_void_p]
+        lib.SileroVAD_get_window_size_samples.restype = ctypes.c_size_t
+
+        lib.SileroVAD_process.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SileroVAD_process.restype = ctypes.c_float
+
+        lib.SileroVAD_process_many.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SileroVAD_process_many.restype = ctypes.c_int64
+
+        lib.SileroVAD_feed.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_int64), ctypes.c_size_t]
+        lib.SileroVAD_feed.restype = ctypes.c_int64
+
+        lib.SileroVAD_set_input.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        lib.SileroVAD_set_input.restype = ctypes.c_int
+
+        lib.SileroVAD_get_pending_samples.argtypes = [ctypes.c_void_p]
+        lib.SileroVAD_get_pending_samples.restype = ctypes.c_size_t
+
+        lib.SileroVAD_reset.argtypes = [ctypes.c_void_p]
+
+        lib.SileroVAD_get_state_size.argtypes = [ctypes.c_void_p]
+        lib.SileroVAD_get_state_size.restype = ctypes.c_size_t
+
+        lib.SileroVAD_get_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SileroVAD_get_state.restype = ctypes.c_int
+
+        lib.SileroVAD_set_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SileroVAD_set_state.restype = ctypes.c_int
+
+        lib.SileroVAD_set_energy_gate.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_float, ctypes.c_float, ctypes.c_int]
+        lib.SileroVAD_set_energy_gate.restype = ctypes.c_int
+
+        lib.SileroVAD_set_stats_enabled.argtypes = [ctypes.c_void_p, ctypes.c_int]
+
+        lib.SileroVAD_get_stats.argtypes = [ctypes.c_void_p, ctypes.POINTER(_InferenceStats)]
+
+        lib.SileroVAD_reset_stats.argtypes = [ctypes.c_void_p]
+
+        lib.SileroVAD_end_profiling.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        lib.SileroVAD_end_profiling.restype = ctypes.c_int64
+
+        lib.SileroVADBatch_new.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(_SessionConfig)]
+        lib.SileroVADBatch_new.restype = ctypes.c_void_p
+
+        lib.SileroVADBatch_delete.argtypes = [ctypes.c_void_p]
+
+        lib.SileroVADBatch_get_window_size_samples.argtypes = [ctypes.c_void_p]
+        lib.SileroVADBatch_get_window_size_samples.restype = ctypes.c_size_t
+
+        lib.SileroVADBatch_add_stream.argtypes = [ctypes.c_void_p]
+        lib.SileroVADBatch_add_stream.restype = ctypes.c_int64
+
+        lib.SileroVADBatch_remove_stream.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+        lib.SileroVADBatch_remove_stream.restype = ctypes.c_int
+
+        lib.SileroVADBatch_process.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int64), ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+        lib.SileroVADBatch_process.restype = ctypes.c_int
+
+        lib.SileroVADMultiChannel_new.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_size_t, ctypes.POINTER(_SessionConfig)]
+        lib.SileroVADMultiChannel_new.restype = ctypes.c_void_p
+
+        lib.SileroVADMultiChannel_delete.argtypes = [ctypes.c_void_p]
+
+        lib.SileroVADMultiChannel_get_window_size_samples.argtypes = [ctypes.c_void_p]
+        lib.SileroVADMultiChannel_get_window_size_samples.restype = ctypes.c_size_t
+
+        lib.SileroVADMultiChannel_set_input.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        lib.SileroVADMultiChannel_set_input.restype = ctypes.c_int
+
+        lib.SileroVADMultiChannel_feed.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_int64), ctypes.c_size_t]
+        lib.SileroVADMultiChannel_feed.restype = ctypes.c_int64
+
+        lib.SileroVADMultiChannel_get_pending_samples.argtypes = [ctypes.c_void_p]
+        lib.SileroVADMultiChannel_get_pending_samples.restype = ctypes.c_size_t
+
+        lib.SileroVADMultiChannel_reset.argtypes = [ctypes.c_void_p]
+
+        lib.SpeechSegmenter_new.argtypes = [ctypes.c_void_p, ctypes.c_float, ctypes.c_float, ctypes.c_int64, ctypes.c_int64, ctypes.c_int64, ctypes.c_int64]
+        lib.SpeechSegmenter_new.restype = ctypes.c_void_p
+
+        lib.SpeechSegmenter_delete.argtypes = [ctypes.c_void_p]
+
+        lib.SpeechSegmenter_process.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SpeechSegmenter_process.restype = ctypes.c_int64
+
+        lib.SpeechSegmenter_process_scores.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SpeechSegmenter_process_scores.restype = ctypes.c_int64
+
+        lib.SpeechSegmenter_flush.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        lib.SpeechSegmenter_flush.restype = ctypes.c_int64
+
+        _lib = lib
+        return _lib
@@ -0,0 +1,35 @@
+import array
+import math
+import os
+import struct
+import wave
+
+
+SAMPLE_WAV_PATH = os.path.join(os.path.dirname(__file__), 'sample.wav')
+
+# Per-window probabilities of the model on sample.wav (at 16 kHz), as in `test_silero_vad_process_wav_file`
+SAMPLE_WAV_PROBABILITIES = [0.31846824288368225, 0.12080410122871399, 0.9278429746627808, 0.9227734804153442, 0.9691531658172607, 0.9847737550735474, 0.9906067848205566, 0.9805426597595215, 0.97320556640625, 0.9933459758758545, 0.9977824687957764, 0.9969353675842285, 0.9895951747894287, 0.9930758476257324, 0.9968366622924805, 0.9980421662330627, 0.9967591762542725, 0.9882574081420898, 0.9961190819740295, 0.9822508096694946, 0.9960722923278809, 0.9989539384841919, 0.9985291957855225, 0.9767082929611206, 0.9802166223526001, 0.9991974830627441, 0.998380184173584, 0.9981842041015625, 0.9984550476074219, 0.9984889030456543, 0.9990912079811096, 0.9931062459945679, 0.9294931888580322, 0.5672889947891235, 0.342951238155365, 0.1822890043258667, 0.09109050035476685]
+
+def generate_audio_data_array(silero_vad):
+    num_samples = silero_vad.window_size_samples
+    sample_rate = silero_vad.sample_rate
+    def audio_data_generator():
+        for i in range(num_samples):
+            t = i / sample_rate
+            yield math.sin(2 * math.pi * 440 * t)
+    return array.array('f', audio_data_generator())
+
+def load_wav_file(file_path):
+    with wave.open(file_path, 'rb') as wav_file:
+        num_channels = wav_file.getnchannels()
+        assert num_channels == 1
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        num_frames = wav_file.getnframes()
+        audio_data = wav_file.readframes(num_frames)
+    return audio_data, num_frames, sample_rate, sample_width
+
+def load_wav_file_float32(file_path):
+    audio_data, num_frames, sample_rate, sample_width = load_wav_file(file_path)
+    assert sample_width == 2
+    return array.array('f', (sample / 32768.0 for sample in struct.unpack(f'<{num_frames}h', audio_data))), sample_rate
@@ -0,0 +1,8 @@
+import pytest
+
+from _audio import SAMPLE_WAV_PATH, load_wav_file_float32
+
+
+@pytest.fixture
+def sample_audio():
+    return load_wav_file_float32(SAMPLE_WAV_PATH)
@@ -0,0 +1,111 @@
+import array
+import math
+
+import pytest
+
+from silero_vad_lite import SileroVAD, SileroVADBatch, SileroVADMultiChannel
+
+
+def test_silero_vad_batch_matches_single_streams(sample_audio):
+    audio, sample_rate = sample_audio
+    batch = SileroVADBatch(sample_rate)
+    window_size_samples = batch.window_size_samples
+    num_windows = len(audio) // window_size_samples
+    offsets = [0, 3, 7]  # Each stream sees the sample audio starting from a different window
+    stream_ids = [batch.add_stream() for _ in offsets]
+    assert batch.stream_ids == sorted(stream_ids)
+    single_vads = [SileroVAD(sample_rate) for _ in offsets]
+    for i in range(num_windows - max(offsets)):
+        windows = [audio[(i + offset) * window_size_samples:(i + offset + 1) * window_size_samples] for offset in offsets]
+        # Submit a partial batch every other step, leaving out the first stream
+        active = range(len(offsets)) if i % 2 == 0 else range(1, len(offsets))
+        data = array.array('f')
+        for s in active:
+            data.extend(windows[s])
+        results = batch.process([stream_ids[s] for s in active], data)
+        assert len(results) == len(active)
+        for s, result in zip(active, results):
+            expected_result = single_vads[s].process(windows[s])
+            assert 0 <= result <= 1
+            assert math.isclose(result, expected_result, abs_tol=1e-5)
+
+def test_silero_vad_batch_add_remove_streams(sample_audio):
+    audio, sample_rate = sample_audio
+    batch = SileroVADBatch(sample_rate)
+    window = audio[:batch.window_size_samples]
+    first = batch.add_stream()
+    second = batch.add_stream()
+    batch.process([first, second], window + window)
+    batch.remove_stream(first)
+    assert batch.stream_ids == [second]
+    with pytest.raises(ValueError):
+        batch.process([first], window)
+    # A new stream starts with a fresh state, even if its id is reused
+    third = batch.add_stream()
+    result = batch.process([third], window)[0]
+    assert math.isclose(result, SileroVAD(sample_rate).process(window), abs_tol=1e-5)
+
+def test_silero_vad_batch_invalid_input(sample_audio):
+    audio, sample_rate = sample_audio
+    batch = SileroVADBatch(sample_rate)
+    window = audio[:batch.window_size_samples]
+    stream_id = batch.add_stream()
+    with pytest.raises(ValueError):
+        batch.process([], window)
+    with pytest.raises(ValueError):
+        batch.process([stream_id, stream_id], window + window)
+    with pytest.raises(ValueError):
+        batch.process([stream_id], window + window)
+    with pytest.raises(ValueError):
+        batch.remove_stream(stream_id + 1)
+
+@pytest.mark.parametrize('input_format', ['float32', 'int16'])
+@pytest.mark.parametrize('input_sample_rate', [None, 48000])
+def test_silero_vad_multi_channel_matches_single_channels(sample_audio, input_format, input_sample_rate):
+    audio, sample_rate = sample_audio
+    # Three channels: the sample audio, the sample audio delayed by one window, and the sample audio at half volume
+    window_size_samples = SileroVAD(sample_rate).window_size_samples
+    channels = [audio, array.array('f', bytes(4 * window_size_samples)) + audio[:-window_size_samples], array.array('f', (sample * 0.5 for sample in audio))]
+    if input_format == 'int16':
+        channels = [array.array('h', (int(sample * 32767) for sample in channel)) for channel in channels]
+    typecode = channels[0].typecode
+    interleaved = array.array(typecode, (sample for frame in zip(*channels) for sample in frame))
+    multi_channel_vad = SileroVADMultiChannel(sample_rate, len(channels), input_format=input_format, input_sample_rate=input_sample_rate)
+    assert multi_channel_vad.num_channels == len(channels)
+    single_vads = [SileroVAD(sample_rate, input_format=input_format, input_sample_rate=input_sample_rate) for _ in channels]
+
+    results = []
+    frame_start = 0
+    for chunk_frames in [100, 2000, 1, 4096, 777] * 10:
+        chunk = interleaved[frame_start * len(channels):(frame_start + chunk_frames) * len(channels)]
+        results += multi_channel_vad.feed(chunk)
+        frame_start += chunk_frames
+    expected_results = [single_vad.feed(channel[:frame_start]) for single_vad, channel in zip(single_vads, channels)]
+    assert len(results) == len(expected_results[0]) > 0
+    assert multi_channel_vad.pending_samples == single_vads[0].pending_samples
+    for i, (offset, scores) in enumerate(results):
+        assert len(scores) == len(channels)
+        for c, score in enumerate(scores):
+            assert expected_results[c][i][0] == offset
+            assert math.isclose(score, expected_results[c][i][1], abs_tol=1e-5)
+
+def test_silero_vad_multi_channel_reset(sample_audio):
+    audio, sample_rate = sample_audio
+    multi_channel_vad = SileroVADMultiChannel(sample_rate, 2)
+    stereo = array.array('f', (sample for pair in zip(audio, audio) for sample in pair))
+    first_results = multi_channel_vad.feed(stereo[:2 * 5000])
+    assert multi_channel_vad.pending_samples > 0
+    multi_channel_vad.reset()
+    assert multi_channel_vad.pending_samples == 0
+    assert multi_channel_vad.feed(stereo[:2 * 5000]) == first_results
+
+def test_silero_vad_multi_channel_invalid_input(sample_audio):
+    audio, sample_rate = sample_audio
+    with pytest.raises(ValueError):
+        SileroVADMultiChannel(sample_rate, 0)
+    with pytest.raises(ValueError):
+        SileroVADMultiChannel(sample_rate, 2, input_format='invalid')
+    multi_channel_vad = SileroVADMultiChannel(sample_rate, 2)
+    with pytest.raises(ValueError):
+        multi_channel_vad.feed(audio[:3])
+    assert multi_channel_vad.feed([]) == []
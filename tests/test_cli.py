@@ -0,0 +1,126 @@
+import csv
+import json
+import math
+import os
+import shutil
+import struct
+
+import pytest
+
+from _audio import SAMPLE_WAV_PATH, load_wav_file
+from silero_vad_lite import SileroVAD, get_speech_timestamps
+from silero_vad_lite.cli import _read_wav_info, main
+
+
+def _write_float32_wav_file(file_path, samples, sample_rate):
+    data = struct.pack(f'<{len(samples)}f', *samples)
+    fmt = struct.pack('<HHIIHH', 3, 1, sample_rate, sample_rate * 4, 4, 32)
+    with open(file_path, 'wb') as file:
+        file.write(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + 6 + 8 + len(data)) + b'WAVE')
+        file.write(b'fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        file.write(b'LIST' + struct.pack('<I', 5) + b'INFO\0\0')  # An odd-sized chunk, which is padded
+        file.write(b'data' + struct.pack('<I', len(data)) + data)
+
+@pytest.fixture
+def wav_dir(tmp_path):
+    input_dir = tmp_path / 'input'
+    (input_dir / 'nested').mkdir(parents=True)
+    shutil.copyfile(SAMPLE_WAV_PATH, input_dir / 'a.wav')
+    shutil.copyfile(SAMPLE_WAV_PATH, input_dir / 'nested' / 'b.wav')
+    (input_dir / 'notes.txt').write_text('not audio')
+    return input_dir
+
+def test_read_wav_info(tmp_path):
+    audio_data, num_frames, sample_rate, _ = load_wav_file(SAMPLE_WAV_PATH)
+    with open(SAMPLE_WAV_PATH, 'rb') as file:
+        contents = file.read()
+    info = _read_wav_info(contents)
+    assert (info.input_format, info.num_channels, info.sample_rate, info.block_align, info.num_samples) == ('int16', 1, sample_rate, 2, num_frames)
+    assert contents[info.data_offset:info.data_offset + 2 * num_frames] == audio_data
+
+    float32_path = str(tmp_path / 'float32.wav')
+    _write_float32_wav_file(float32_path, [0.0, 0.5, -0.5], 8000)
+    with open(float32_path, 'rb') as file:
+        contents = file.read()
+    info = _read_wav_info(contents)
+    assert (info.input_format, info.num_channels, info.sample_rate, info.block_align, info.num_samples) == ('float32', 1, 8000, 4, 3)
+    assert struct.unpack_from('<3f', contents, info.data_offset) == (0.0, 0.5, -0.5)
+
+    with pytest.raises(ValueError):
+        _read_wav_info(b'not a wav file')
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_cli_segments_jsonl(wav_dir, tmp_path, workers):
+    output_path = str(tmp_path / 'segments.jsonl')
+    assert main([str(wav_dir), '-o', output_path, '-j', str(workers)]) == 0
+    with open(output_path) as file:
+        records = sorted((json.loads(line) for line in file), key=lambda record: record['path'])
+    assert [record['path'] for record in records] == [str(wav_dir / 'a.wav'), str(wav_dir / 'nested' / 'b.wav')]
+    audio_data, _, sample_rate, _ = load_wav_file(SAMPLE_WAV_PATH)
+    expected_segments = [dict(start=round(segment['start'] / 16000, 4), end=round(segment['end'] / 16000, 4)) for segment in get_speech_timestamps(audio_data, 16000, input_format='int16', input_sample_rate=sample_rate)]
+    for record in records:
+        assert record['segments'] == expected_segments
+
+def test_cli_probabilities_csv(tmp_path):
+    output_path = str(tmp_path / 'probabilities.csv')
+    assert main([SAMPLE_WAV_PATH, '-o', output_path, '-f', 'csv', '-m', 'probabilities', '-j', '1']) == 0
+    with open(output_path, newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ['path', 'time', 'probability']
+    audio_data, _, sample_rate, _ = load_wav_file(SAMPLE_WAV_PATH)
+    expected_results = SileroVAD(16000, input_format='int16', input_sample_rate=sample_rate).feed(audio_data)
+    assert len(rows) - 1 == len(expected_results)
+    for row, (offset, score) in zip(rows[1:], expected_results):
+        assert row[0] == os.path.abspath(SAMPLE_WAV_PATH)
+        assert math.isclose(float(row[1]), offset / 16000, abs_tol=1e-4)
+        assert math.isclose(float(row[2]), score, abs_tol=1e-6)
+
+def test_cli_resume(wav_dir, tmp_path):
+    output_path = str(tmp_path / 'segments.csv')
+    args = [str(wav_dir), '-o', output_path, '-f', 'csv', '-j', '1', '--resume']
+    assert main(args) == 0
+    with open(output_path) as file:
+        complete_output = file.read()
+
+    # Simulate a run interrupted while writing the results of the second file
+    progress_path = output_path + '.progress'
+    with open(progress_path) as file:
+        progress_lines = file.readlines()
+    assert len(progress_lines) == 2
+    with open(progress_path, 'w') as file:
+        file.write(progress_lines[0])
+    with open(output_path, 'a') as file:
+        file.write('partial,res')
+
+    assert main(args) == 0
+    with open(output_path) as file:
+        assert file.read() == complete_output
+    with open(progress_path) as file:
+        assert file.readlines() == progress_lines
+
+    # Everything is done, so nothing more is written
+    assert main(args) == 0
+    with open(output_path) as file:
+        assert file.read() == complete_output
+
+def test_cli_invalid_file(tmp_path, capsys):
+    invalid_path = tmp_path / 'invalid.wav'
+    invalid_path.write_bytes(b'RIFF\0\0\0\0WAVE')
+    output_path = str(tmp_path / 'segments.jsonl')
+    assert main([str(invalid_path), SAMPLE_WAV_PATH, '-o', output_path, '-j', '1']) == 1
+    assert str(invalid_path) in capsys.readouterr().err
+    with open(output_path) as file:
+        assert [json.loads(line)['path'] for line in file] == [os.path.abspath(SAMPLE_WAV_PATH)]
+
+def test_cli_repeated_runs_in_process(tmp_path):
+    audio_data, _, sample_rate, _ = load_wav_file(SAMPLE_WAV_PATH)
+    for output_sample_rate in [8000, 16000]:
+        output_path = str(tmp_path / f'probabilities_{output_sample_rate}.csv')
+        assert main([SAMPLE_WAV_PATH, '-o', output_path, '-f', 'csv', '-m', 'probabilities', '-j', '1', '--sample-rate', str(output_sample_rate)]) == 0
+        with open(output_path, newline='') as file:
+            rows = list(csv.reader(file))
+        expected_results = SileroVAD(output_sample_rate, input_format='int16', input_sample_rate=sample_rate).feed(audio_data)
+        assert len(rows) - 1 == len(expected_results)
+        for row, (offset, score) in zip(rows[1:], expected_results):
+            assert math.isclose(float(row[1]), offset / output_sample_rate, abs_tol=1e-4)
+            assert math.isclose(float(row[2]), score, abs_tol=1e-6)
@@ -0,0 +1,63 @@
+import array
+import math
+import queue
+
+import pytest
+
+from _audio import generate_audio_data_array
+from silero_vad_lite import SileroVAD, SileroVADPool
+
+
+def test_silero_vad_pool():
+    pool = SileroVADPool(16000, size=2, max_size=3)
+    assert pool.num_created == 2
+    assert pool.num_idle == 2
+    audio_data = generate_audio_data_array(SileroVAD(16000)) * 32
+    window = audio_data[:512]
+    expected_results = SileroVAD(16000).feed(audio_data)
+    vads = [pool.acquire() for _ in range(3)]
+    assert pool.num_created == 3
+    assert len(set(map(id, vads))) == 3
+    with pytest.raises(queue.Empty):
+        pool.acquire(block=False)
+    with pytest.raises(queue.Empty):
+        pool.acquire(timeout=0.01)
+    for vad in vads:
+        vad.feed(audio_data[:1000])
+        pool.release(vad)
+    assert pool.num_idle == 3
+    # Only acquired objects can be released, and only once
+    with pytest.raises(ValueError):
+        pool.release(vads[0])
+    with pytest.raises(ValueError):
+        pool.release(SileroVAD(16000))
+    assert pool.num_idle == 3
+    # Released objects are reset, so they behave like new ones
+    with pool.borrow() as vad:
+        assert vad in vads
+        assert vad.pending_samples == 0
+        assert vad.feed(audio_data) == expected_results
+    assert pool.num_idle == 3
+    assert math.isclose(pool.acquire().process(window), SileroVAD(16000).process(window), abs_tol=1e-6)
+
+def test_silero_vad_pool_unlimited():
+    pool = SileroVADPool(8000, size=0, input_format='int16')
+    vads = [pool.acquire() for _ in range(5)]
+    assert pool.num_created == 5
+    assert all(vad.input_format == 'int16' for vad in vads)
+
+def test_silero_vad_pool_resampled():
+    pool = SileroVADPool(16000, size=1, input_format='int16', input_sample_rate=48000)
+    vad = pool.acquire()
+    assert vad.pending_samples == 0
+    assert vad.feed(array.array('h', bytes(2 * 3 * 2 * vad.window_size_samples)))[0][0] == 0
+
+def test_silero_vad_pool_warm_up_not_in_stats():
+    pool = SileroVADPool(16000, size=1, enable_stats=True, energy_gate=dict(mode='rms', floor_db=-50.0))
+    vad = pool.acquire()
+    # The warm-up ran the model despite the energy gate, but is not counted
+    assert vad.stats['num_windows'] == 0
+    assert vad.stats['num_gated_windows'] == 0
+    assert vad.energy_gate == dict(mode='rms', floor_db=-50.0, probability=0.0, reset_state=False)
+    vad.process(array.array('f', bytes(4 * vad.window_size_samples)))
+    assert vad.stats['num_gated_windows'] == 1
@@ -0,0 +1,66 @@
+import array
+
+import pytest
+
+from _audio import SAMPLE_WAV_PROBABILITIES
+from silero_vad_lite import SileroVAD, SpeechSegmenter, get_speech_timestamps
+
+
+def test_get_speech_timestamps(sample_audio):
+    audio, sample_rate = sample_audio
+    # Speech (per the expected scores in test_silero_vad_process_wav_file) begins at window 2 and falls below neg_threshold at window 34, with fewer than min_silence_duration_ms of windows remaining
+    timestamps = get_speech_timestamps(audio, sample_rate)
+    assert timestamps == [dict(start=2 * 512 - 480, end=34 * 512 + 480)]
+
+@pytest.mark.parametrize('chunk_size', [512, 160, 1500])
+def test_speech_segmenter_streaming_matches_offline(sample_audio, chunk_size):
+    audio, sample_rate = sample_audio
+    params = dict(min_speech_duration_ms=32, min_silence_duration_ms=32, speech_pad_ms=10, max_speech_duration_s=0.3)
+    segmenter = SpeechSegmenter(SileroVAD(sample_rate), **params)
+    events = []
+    for i in range(0, len(audio), chunk_size):
+        events += segmenter.process(audio[i:i + chunk_size])
+    events += segmenter.flush()
+    assert len(events) >= 2
+    assert [event for event, sample in events] == ['start', 'end'] * (len(events) // 2)
+    samples = [sample for event, sample in events]
+    assert samples == sorted(samples)
+    # Segments are split to respect max_speech_duration_s
+    for start, end in zip(samples[0::2], samples[1::2]):
+        assert 0 < end - start <= 0.3 * sample_rate
+    assert get_speech_timestamps(audio, sample_rate, **params) == [dict(start=start, end=end) for start, end in zip(samples[0::2], samples[1::2])]
+
+@pytest.mark.parametrize('max_speech_duration_s', [0.3, 0.5, 0.05])
+def test_speech_segmenter_max_speech_duration(max_speech_duration_s):
+    segmenter = SpeechSegmenter(SileroVAD(16000), min_speech_duration_ms=32, min_silence_duration_ms=32, speech_pad_ms=10, max_speech_duration_s=max_speech_duration_s)
+    events = segmenter.process_scores(SAMPLE_WAV_PROBABILITIES) + segmenter.flush()
+    assert [event for event, sample in events] == ['start', 'end'] * (len(events) // 2)
+    samples = [sample for event, sample in events]
+    segments = list(zip(samples[0::2], samples[1::2]))
+    assert len(segments) > 1
+    for start, end in segments:
+        assert 0 < end - start <= max_speech_duration_s * 16000
+    # Continuing speech is split into adjacent segments
+    for (_, end), (next_start, _) in zip(segments, segments[1:]):
+        assert next_start == end
+
+def test_speech_segmenter_process_scores(sample_audio):
+    audio, sample_rate = sample_audio
+    params = dict(min_speech_duration_ms=32, min_silence_duration_ms=32, speech_pad_ms=10, max_speech_duration_s=0.3)
+    segmenter = SpeechSegmenter(SileroVAD(sample_rate), **params)
+    expected_events = segmenter.process(audio) + segmenter.flush()
+    window_size_samples = segmenter.vad.window_size_samples
+    scores = SileroVAD(sample_rate).process_many(audio[:len(audio) // window_size_samples * window_size_samples])
+    segmenter = SpeechSegmenter(SileroVAD(sample_rate), **params)
+    assert segmenter.process_scores(scores[:10]) + segmenter.process_scores(scores[10:]) + segmenter.flush() == expected_events
+
+def test_speech_segmenter_invalid_input():
+    vad = SileroVAD(16000)
+    with pytest.raises(ValueError):
+        SpeechSegmenter(vad, threshold=0.5, neg_threshold=0.6)
+    segmenter = SpeechSegmenter(vad)
+    with pytest.raises(TypeError):
+        segmenter.process('invalid input')
+    with pytest.raises(TypeError):
+        segmenter.process_scores('invalid input')
+    assert segmenter.process([]) == []
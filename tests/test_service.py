@@ -0,0 +1,89 @@
+import array
+import asyncio
+import math
+import threading
+
+import pytest
+
+from silero_vad_lite import AsyncSileroVADService, SileroVAD, SileroVADService
+
+
+def _get_windows(audio, window_size_samples, offset):
+    # Each stream sees the sample audio starting from a different window
+    return [audio[i * window_size_samples:(i + 1) * window_size_samples] for i in range(offset, len(audio) // window_size_samples)]
+
+def _get_expected_results(sample_rate, windows):
+    vad = SileroVAD(sample_rate)
+    return [vad.process(window) for window in windows]
+
+
+def test_silero_vad_service(sample_audio):
+    audio, sample_rate = sample_audio
+    with SileroVADService(sample_rate, num_workers=3, max_queue_size=4) as service:
+        stream_ids = [service.open_stream() for _ in range(5)]
+        window_size_samples = SileroVAD(sample_rate).window_size_samples
+        stream_windows = [_get_windows(audio, window_size_samples, offset) for offset in range(len(stream_ids))]
+        futures = [[] for _ in stream_ids]
+        for i in range(max(len(windows) for windows in stream_windows)):
+            for stream_index, stream_id in enumerate(stream_ids):
+                if i < len(stream_windows[stream_index]):
+                    futures[stream_index].append(service.submit(stream_id, stream_windows[stream_index][i], timeout=10))
+        for stream_index, stream_futures in enumerate(futures):
+            results = [future.result(timeout=10) for future in stream_futures]
+            expected_results = _get_expected_results(sample_rate, stream_windows[stream_index])
+            for result, expected_result in zip(results, expected_results):
+                assert math.isclose(result, expected_result, abs_tol=1e-6)
+        feed_future = service.submit(service.open_stream(), audio[:1000], method='feed')
+        assert [offset for offset, _ in feed_future.result(timeout=10)] == [0]
+        service.close_stream(stream_ids[0])
+        with pytest.raises(ValueError):
+            service.submit(stream_ids[0], audio[:window_size_samples])
+        error_future = service.submit(stream_ids[1], audio[:window_size_samples + 1])
+        with pytest.raises(ValueError):
+            error_future.result(timeout=10)
+    with pytest.raises(RuntimeError):
+        service.open_stream()
+
+def test_silero_vad_service_submit_during_shutdown(sample_audio):
+    audio, sample_rate = sample_audio
+    service = SileroVADService(sample_rate, num_workers=2, max_queue_size=1)
+    stream_ids = [service.open_stream() for _ in range(2)]
+    assert sorted(service.get_worker_index(stream_id) for stream_id in stream_ids) == [0, 1]
+    window = audio[:SileroVAD(sample_rate).window_size_samples]
+    futures = []
+
+    def submit_until_shutdown(stream_id):
+        while True:
+            try:
+                futures.append(service.submit(stream_id, window))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submit_until_shutdown, args=(stream_id,)) for stream_id in stream_ids]
+    for thread in threads:
+        thread.start()
+    service.shutdown()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    # Every request accepted before the shutdown was completed
+    assert all(future.done() for future in futures)
+
+def test_async_silero_vad_service(sample_audio):
+    audio, sample_rate = sample_audio
+    window_size_samples = SileroVAD(sample_rate).window_size_samples
+
+    async def run_stream(service, offset):
+        stream_id = await service.open_stream()
+        windows = _get_windows(audio, window_size_samples, offset)
+        results = [await service.process(stream_id, window) for window in windows]
+        service.close_stream(stream_id)
+        return windows, results
+
+    async def run():
+        async with AsyncSileroVADService(sample_rate, num_workers=2, max_queue_size=2) as service:
+            return await asyncio.gather(*(run_stream(service, offset) for offset in range(4)))
+
+    for windows, results in asyncio.run(run()):
+        for result, expected_result in zip(results, _get_expected_results(sample_rate, windows)):
+            assert math.isclose(result, expected_result, abs_tol=1e-6)
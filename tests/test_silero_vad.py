@@ -4,33 +4,14 @@ import ctypes
 import math
 import os
 import struct
-import wave
 
 import pytest
 
+from _audio import SAMPLE_WAV_PATH, generate_audio_data_array as _generate_audio_data_array, load_wav_file as _load_wav_file
+import silero_vad_lite._buffer
 from silero_vad_lite import SileroVAD
 
 
-def _generate_audio_data_array(silero_vad):
-    num_samples = silero_vad.window_size_samples
-    sample_rate = silero_vad.sample_rate
-    def audio_data_generator():
-        for i in range(num_samples):
-            t = i / sample_rate
-            yield math.sin(2 * math.pi * 440 * t)
-    return array.array('f', audio_data_generator())
-
-def _load_wav_file(file_path):
-    with wave.open(file_path, 'rb') as wav_file:
-        num_channels = wav_file.getnchannels()
-        assert num_channels == 1
-        sample_width = wav_file.getsampwidth()
-        sample_rate = wav_file.getframerate()
-        num_frames = wav_file.getnframes()
-        audio_data = wav_file.readframes(num_frames)
-    return audio_data, num_frames, sample_rate, sample_width
-
-
 @pytest.fixture
 def silero_vad():
     return SileroVAD(16000)
@@ -58,6 +39,62 @@ def test_silero_vad_process(sample_rate, data_type):
         # test_silero_vad_process[Array-8000] - assert <silero_vad_l...x7fee623695b0> == <silero_vad_l...x7fee62369520>
         assert audio_data == audio_data_orig
 
+def test_silero_vad_process_zero_copy(silero_vad):
+    audio_data = _generate_audio_data_array(silero_vad)
+    expected_result = SileroVAD(silero_vad.sample_rate).process(audio_data)
+    # Read-only views, views of raw bytes, and slices of a larger buffer are all processed in place
+    padded_data = array.array('f', [0.0]) + audio_data + array.array('f', [0.0])
+    for data in [memoryview(bytes(audio_data)), memoryview(audio_data).toreadonly(), memoryview(padded_data)[1:-1], memoryview(padded_data).cast('B')[4:-4]]:
+        silero_vad.reset()
+        assert math.isclose(silero_vad.process(data), expected_result, abs_tol=1e-6)
+    with pytest.raises(ValueError):
+        silero_vad.process(memoryview(padded_data)[::2])  # Not contiguous
+    with pytest.raises(ValueError):
+        silero_vad.process(array.array('d', audio_data))  # Wrong sample type
+
+def test_silero_vad_process_without_pythonapi(monkeypatch):
+    # As on implementations without `ctypes.pythonapi`, such as PyPy
+    monkeypatch.setattr(silero_vad_lite._buffer, '_PyObject_GetBuffer', None)
+    silero_vad = SileroVAD(16000)
+    audio_data = _generate_audio_data_array(silero_vad)
+    expected_result = SileroVAD(silero_vad.sample_rate).process(audio_data)
+    for data in [audio_data, bytes(audio_data), memoryview(audio_data).toreadonly(), list(audio_data)]:
+        silero_vad.reset()
+        assert math.isclose(silero_vad.process(data), expected_result, abs_tol=1e-6)
+    out = array.array('f', [-1.0] * 2)
+    assert silero_vad.process_many(audio_data, out=out) is out
+    assert out[1] == -1.0
+    with pytest.raises(ValueError):
+        silero_vad.process(memoryview(audio_data * 2)[::2])  # Not contiguous
+    with pytest.raises(ValueError):
+        silero_vad.process(array.array('d', audio_data))  # Wrong sample type
+    with pytest.raises(ValueError):
+        silero_vad.process_many(audio_data, out=bytes(4))  # Not writable
+
+def test_buffer_acquire_while_in_use():
+    buffer = silero_vad_lite._buffer._Buffer()
+    data = array.array('f', [1.0, 2.0])
+    with buffer.acquire(data, 4, 'f') as (address, length):
+        # Acquiring it again (e.g. from another thread) uses a separate view, rather than releasing this one twice
+        with buffer.acquire(bytes(12), 4, 'f') as (other_address, other_length):
+            assert other_length == 3
+        assert (ctypes.c_float * length).from_address(address)[:] == [1.0, 2.0]
+    with buffer.acquire(data, 4, 'f') as (address, length):
+        assert length == 2
+
+def test_silero_vad_process_numpy(silero_vad):
+    np = pytest.importorskip('numpy')
+    audio_data = _generate_audio_data_array(silero_vad)
+    expected_result = SileroVAD(silero_vad.sample_rate).process(audio_data)
+    np_array = np.frombuffer(bytes(audio_data), dtype=np.float32)
+    assert not np_array.flags.writeable
+    assert math.isclose(silero_vad.process(np_array), expected_result, abs_tol=1e-6)
+    out = np.full(4, -1.0, dtype=np.float32)
+    assert silero_vad.process_many(np.concatenate([np_array] * 2), out=out) is out
+    assert out[2] == -1.0
+    with pytest.raises(ValueError):
+        silero_vad.process(np_array.astype(np.float64))
+
 def test_silero_vad_process_wav_file():
     file_path = os.path.join(os.path.dirname(__file__), 'sample.wav')
     audio_data, num_frames, sample_rate, sample_width = _load_wav_file(file_path)
@@ -82,6 +119,275 @@ def test_silero_vad_process_wav_file():
     for result, expected_result in zip(results, expected_results):
         assert math.isclose(result, expected_result, abs_tol=1e-6)
 
+@pytest.mark.parametrize('use_out', [False, True])
+def test_silero_vad_process_many(sample_audio, use_out):
+    audio_data, sample_rate = sample_audio
+    silero_vad = SileroVAD(sample_rate)
+    window_size_samples = silero_vad.window_size_samples
+    num_windows = len(audio_data) // window_size_samples
+    audio_data = audio_data[:num_windows * window_size_samples]
+    out = array.array('f', [-1.0] * (num_windows + 1)) if use_out else None
+    results = silero_vad.process_many(audio_data, out=out)
+    assert isinstance(results, array.array)
+    if use_out:
+        assert results is out
+        assert results[-1] == -1.0
+    assert len(results) >= num_windows
+    reference_vad = SileroVAD(sample_rate)
+    for i in range(num_windows):
+        expected_result = reference_vad.process(audio_data[i * window_size_samples:(i + 1) * window_size_samples])
+        assert math.isclose(results[i], expected_result, abs_tol=1e-6)
+
+def test_silero_vad_process_many_invalid_input(silero_vad):
+    with pytest.raises(ValueError):
+        silero_vad.process_many([])
+    with pytest.raises(ValueError):
+        silero_vad.process_many([0.0] * (silero_vad.window_size_samples + 1))
+    with pytest.raises(ValueError):
+        silero_vad.process_many([0.0] * (silero_vad.window_size_samples * 2), out=array.array('f', [0.0]))
+    with pytest.raises(ValueError):
+        silero_vad.process_many([0.0] * silero_vad.window_size_samples, out=bytes(4))  # Not writable
+
+@pytest.mark.parametrize('chunk_sizes', [[512], [160], [320, 37, 1024, 1, 700]])
+def test_silero_vad_feed(sample_audio, chunk_sizes):
+    audio_data, sample_rate = sample_audio
+    num_frames = len(audio_data)
+    silero_vad = SileroVAD(sample_rate)
+    window_size_samples = silero_vad.window_size_samples
+    results = []
+    offset = 0
+    i = 0
+    while offset < num_frames:
+        chunk = audio_data[offset:offset + chunk_sizes[i % len(chunk_sizes)]]
+        results += silero_vad.feed(chunk)
+        offset += len(chunk)
+        i += 1
+        assert silero_vad.pending_samples == offset - len(results) * window_size_samples
+    assert silero_vad.feed(array.array('f')) == []
+    num_windows = num_frames // window_size_samples
+    assert [offset for offset, _ in results] == [i * window_size_samples for i in range(num_windows)]
+    expected_results = SileroVAD(sample_rate).process_many(audio_data[:num_windows * window_size_samples])
+    for (_, result), expected_result in zip(results, expected_results):
+        assert math.isclose(result, expected_result, abs_tol=1e-6)
+
+@pytest.mark.parametrize('data_type', [bytes, array.array])
+def test_silero_vad_feed_int16(sample_audio, data_type):
+    audio_data, num_frames, sample_rate, sample_width = _load_wav_file(SAMPLE_WAV_PATH)
+    if data_type == array.array:
+        audio_data = array.array('h', audio_data)
+    silero_vad = SileroVAD(sample_rate, input_format='int16')
+    results = silero_vad.feed(audio_data)
+    float_audio_data, _ = sample_audio
+    num_windows = num_frames // silero_vad.window_size_samples
+    expected_results = SileroVAD(sample_rate).process_many(float_audio_data[:num_windows * silero_vad.window_size_samples])
+    assert len(results) == num_windows
+    for (_, result), expected_result in zip(results, expected_results):
+        assert math.isclose(result, expected_result, abs_tol=1e-6)
+
+@pytest.mark.parametrize('input_sample_rate', [44100, 48000])
+def test_silero_vad_feed_resampled(input_sample_rate):
+    silero_vad = SileroVAD(16000, input_format='int16', input_sample_rate=input_sample_rate)
+    assert silero_vad.input_sample_rate == input_sample_rate
+    packet_samples = input_sample_rate // 100  # 10ms packets
+    packet = array.array('h', (int(8000 * math.sin(2 * math.pi * 440 * i / input_sample_rate)) for i in range(packet_samples)))
+    results = []
+    for _ in range(100):  # 1 second
+        results += silero_vad.feed(packet)
+    # 1 second of input is resampled to 16000 samples, minus the few samples of resampler lookahead still needed to produce the last ones
+    assert len(results) == 16000 // silero_vad.window_size_samples
+    assert [offset for offset, _ in results] == [i * silero_vad.window_size_samples for i in range(len(results))]
+    assert all(0 <= result <= 1 for _, result in results)
+
+def test_silero_vad_process_int16(sample_audio):
+    audio_data, num_frames, sample_rate, sample_width = _load_wav_file(SAMPLE_WAV_PATH)
+    int16_audio_data = array.array('h', audio_data)
+    float_audio_data, _ = sample_audio
+    silero_vad = SileroVAD(sample_rate, input_format='int16')
+    window_size_samples = silero_vad.window_size_samples
+    num_windows = num_frames // window_size_samples
+    results = silero_vad.process_many(int16_audio_data[:num_windows * window_size_samples])
+    expected_results = SileroVAD(sample_rate).process_many(float_audio_data[:num_windows * window_size_samples])
+    assert len(results) == num_windows
+    for result, expected_result in zip(results, expected_results):
+        assert math.isclose(result, expected_result, abs_tol=1e-6)
+    silero_vad.reset()
+    result = silero_vad.process(audio_data[:window_size_samples * 2])  # Raw bytes of int16 samples
+    assert math.isclose(result, expected_results[0], abs_tol=1e-6)
+    with pytest.raises(ValueError):
+        silero_vad.process(audio_data[:window_size_samples * 4])
+
+def test_silero_vad_process_resampled():
+    silero_vad = SileroVAD(16000, input_format='int16', input_sample_rate=48000)
+    with pytest.raises(ValueError):
+        silero_vad.process(array.array('h', bytes(2 * silero_vad.window_size_samples)))
+    with pytest.raises(ValueError):
+        silero_vad.process_many(array.array('h', bytes(2 * silero_vad.window_size_samples)))
+
+def test_silero_vad_invalid_input_format():
+    with pytest.raises(ValueError):
+        SileroVAD(16000, input_format='int24')
+    with pytest.raises(ValueError):
+        SileroVAD(16000, input_format='int16').feed(b'\x00\x00\x00')
+
+def test_silero_vad_reset(sample_audio):
+    audio_data, sample_rate = sample_audio
+    silero_vad = SileroVAD(sample_rate)
+    expected_results = silero_vad.feed(audio_data)
+    assert silero_vad.pending_samples > 0
+    silero_vad.reset()
+    assert silero_vad.pending_samples == 0
+    assert silero_vad.get_state() == array.array('f', [0.0] * len(silero_vad.get_state()))
+    assert silero_vad.feed(audio_data) == expected_results
+
+def test_silero_vad_get_set_state(sample_audio):
+    audio_data, sample_rate = sample_audio
+    silero_vad = SileroVAD(sample_rate)
+    window_size_samples = silero_vad.window_size_samples
+    num_windows = len(audio_data) // window_size_samples
+    expected_results = silero_vad.process_many(audio_data[:num_windows * window_size_samples])
+    # Migrate the stream to another object halfway through
+    first_vad, second_vad = SileroVAD(sample_rate), SileroVAD(sample_rate)
+    half = num_windows // 2
+    results = list(first_vad.process_many(audio_data[:half * window_size_samples]))
+    state = first_vad.get_state()
+    assert len(state) == 2 * 128
+    second_vad.set_state(state)
+    results += second_vad.process_many(audio_data[half * window_size_samples:num_windows * window_size_samples])
+    assert results == list(expected_results)
+    with pytest.raises(ValueError):
+        second_vad.set_state(state[:-1])
+
+def test_silero_vad_instances_have_independent_state(sample_audio):
+    audio_data, sample_rate = sample_audio
+    # Instances share the model session, but each must keep its own model state
+    vads = [SileroVAD(sample_rate) for _ in range(3)]
+    window_size_samples = vads[0].window_size_samples
+    for i in range(len(audio_data) // window_size_samples):
+        chunk = audio_data[i * window_size_samples:(i + 1) * window_size_samples]
+        results = [vad.process(chunk) for vad in vads]
+        assert results[0] == results[1] == results[2]
+    # A new instance starts from a fresh state
+    fresh_vad = SileroVAD(sample_rate)
+    assert fresh_vad.process(audio_data[:window_size_samples]) == SileroVAD(sample_rate).process(audio_data[:window_size_samples])
+
+@pytest.mark.parametrize('session_options', [
+    dict(intra_op_num_threads=2),
+    dict(execution_mode='parallel', inter_op_num_threads=2),
+    dict(graph_optimization_level='disabled', enable_cpu_mem_arena=False, enable_mem_pattern=False),
+])
+def test_silero_vad_session_options(silero_vad, session_options):
+    audio_data = _generate_audio_data_array(silero_vad)
+    result = SileroVAD(silero_vad.sample_rate, **session_options).process(audio_data)
+    assert math.isclose(result, silero_vad.process(audio_data), abs_tol=1e-5)
+
+def test_silero_vad_optimized_model_path(silero_vad, tmp_path):
+    optimized_model_path = str(tmp_path / 'silero_vad.optimized.onnx')
+    audio_data = _generate_audio_data_array(silero_vad)
+    expected_result = silero_vad.process(audio_data)
+    optimized_vad = SileroVAD(silero_vad.sample_rate, graph_optimization_level='extended', optimized_model_path=optimized_model_path)
+    assert os.path.exists(optimized_model_path)
+    assert math.isclose(optimized_vad.process(audio_data), expected_result, abs_tol=1e-5)
+    del optimized_vad  # Release the shared session, so the next instance loads the cached optimized model
+    cached_vad = SileroVAD(silero_vad.sample_rate, graph_optimization_level='extended', optimized_model_path=optimized_model_path)
+    assert math.isclose(cached_vad.process(audio_data), expected_result, abs_tol=1e-5)
+
+def test_silero_vad_optimized_model_path_corrupt(silero_vad, tmp_path):
+    optimized_model_path = tmp_path / 'silero_vad.optimized.onnx'
+    optimized_model_path.write_bytes(b'corrupt, e.g. partially written')
+    audio_data = _generate_audio_data_array(silero_vad)
+    optimized_vad = SileroVAD(silero_vad.sample_rate, graph_optimization_level='extended', optimized_model_path=str(optimized_model_path))
+    assert math.isclose(optimized_vad.process(audio_data), silero_vad.process(audio_data), abs_tol=1e-5)
+    # The corrupt file is replaced by a newly optimized model, with no temporary files left behind
+    assert optimized_model_path.read_bytes() != b'corrupt, e.g. partially written'
+    assert os.listdir(tmp_path) == ['silero_vad.optimized.onnx']
+
+def test_silero_vad_stats(silero_vad):
+    assert not silero_vad.stats_enabled
+    audio_data = _generate_audio_data_array(silero_vad)
+    silero_vad.process(audio_data)
+    assert silero_vad.stats['num_windows'] == 0
+    silero_vad.stats_enabled = True
+    silero_vad.process_many(audio_data * 3)
+    stats = silero_vad.stats
+    assert stats['num_windows'] == 3
+    assert sum(stats['histogram']) == 3
+    assert 0 < stats['min_ns'] <= stats['last_ns'] <= stats['max_ns'] <= stats['total_ns']
+    assert stats['min_ns'] <= stats['mean_ns'] <= stats['max_ns']
+    silero_vad.reset()
+    assert silero_vad.stats['num_windows'] == 3
+    silero_vad.reset_stats()
+    assert silero_vad.stats['num_windows'] == 0
+    assert sum(silero_vad.stats['histogram']) == 0
+
+@pytest.mark.parametrize('reset_state', [False, True])
+def test_silero_vad_energy_gate(reset_state):
+    silero_vad = SileroVAD(16000, enable_stats=True, energy_gate=dict(mode='rms', floor_db=-40.0, probability=0.25, reset_state=reset_state))
+    assert silero_vad.energy_gate == dict(mode='rms', floor_db=-40.0, probability=0.25, reset_state=reset_state)
+    loud_window = _generate_audio_data_array(silero_vad)
+    quiet_window = array.array('f', (sample * 0.001 for sample in loud_window))  # About -63 dBFS RMS
+    reference_vad = SileroVAD(16000)
+    assert math.isclose(silero_vad.process(loud_window), reference_vad.process(loud_window), abs_tol=1e-6)
+    assert silero_vad.process(quiet_window) == 0.25
+    # The gated window either leaves the state as it was, or resets it as at the start of a stream
+    if reset_state:
+        reference_vad.reset()
+    assert math.isclose(silero_vad.process(loud_window), reference_vad.process(loud_window), abs_tol=1e-6)
+    stats = silero_vad.stats
+    assert stats['num_windows'] == 2
+    assert stats['num_gated_windows'] == 1
+    assert sum(stats['histogram']) == 2
+    # Gated windows still advance the stream offset
+    assert [offset for offset, _ in silero_vad.feed(quiet_window + loud_window)] == [3 * 512, 4 * 512]
+
+def test_silero_vad_energy_gate_without_stats():
+    silero_vad = SileroVAD(16000, energy_gate='rms')
+    assert not silero_vad.stats_enabled
+    silero_vad.process_many(array.array('f', bytes(4 * 10 * silero_vad.window_size_samples)))
+    stats = silero_vad.stats
+    assert stats['num_gated_windows'] == 10
+    assert stats['num_windows'] == 0
+    silero_vad.reset_stats()
+    assert silero_vad.stats['num_gated_windows'] == 0
+
+def test_silero_vad_energy_gate_modes(silero_vad):
+    assert silero_vad.energy_gate is None
+    spike_window = array.array('f', bytes(4 * silero_vad.window_size_samples))
+    spike_window[0] = 0.5  # A high peak, but a low RMS (about -39 dBFS)
+    silero_vad.set_energy_gate('peak', floor_db=-30.0, probability=0.0)
+    silero_vad.stats_enabled = True
+    silero_vad.process(spike_window)
+    assert silero_vad.stats['num_gated_windows'] == 0
+    silero_vad.set_energy_gate('rms', floor_db=-30.0, probability=0.0)
+    silero_vad.process(spike_window)
+    assert silero_vad.stats['num_gated_windows'] == 1
+    silero_vad.set_energy_gate(None)
+    assert silero_vad.energy_gate is None
+    silero_vad.process(spike_window)
+    assert silero_vad.stats['num_gated_windows'] == 1
+    with pytest.raises(ValueError):
+        silero_vad.set_energy_gate('invalid')
+    with pytest.raises(ValueError):
+        silero_vad.set_energy_gate('rms', probability=1.5)
+    with pytest.raises(ValueError):
+        SileroVAD(16000, energy_gate='invalid')
+
+def test_silero_vad_profiling(silero_vad, tmp_path):
+    assert silero_vad.end_profiling() is None
+    profile_file_prefix = str(tmp_path / 'silero_vad_profile')
+    profiled_vad = SileroVAD(silero_vad.sample_rate, profile_file_prefix=profile_file_prefix)
+    profiled_vad.process(_generate_audio_data_array(profiled_vad))
+    profile_path = profiled_vad.end_profiling()
+    assert os.path.basename(profile_path).startswith('silero_vad_profile')
+    assert os.path.exists(profile_path)
+
+def test_silero_vad_invalid_session_options():
+    with pytest.raises(ValueError):
+        SileroVAD(16000, execution_mode='invalid')
+    with pytest.raises(ValueError):
+        SileroVAD(16000, graph_optimization_level='invalid')
+    with pytest.raises(TypeError):
+        SileroVAD(16000, invalid_option=True)
+
 def test_silero_vad_process_invalid_input(silero_vad):
     with pytest.raises(TypeError):
         silero_vad.process('invalid input')